@@ -3,28 +3,24 @@
 # Supports: English, Science, Maths, ESL, Chemistry
 
 import streamlit as st
-import tempfile
 import os
-import pandas as pd
-import io
-import random
-import re
 from datetime import datetime, timedelta
-from docx import Document
 
 import sys
+# Bytecode writing stays off unless fast-start mode is on (see fast_start.py)
 sys.dont_write_bytecode = True
+from fast_start import FAST_START
+if FAST_START:
+    sys.dont_write_bytecode = False
 
 # Add this at the VERY TOP for import fixes
-import os
-import sys
 sys.path.insert(0, os.path.abspath('.'))
 
 # SECURITY & PRIVACY SETTINGS
-TARGET_CHARS = 500
 MAX_FILE_SIZE_MB = 5
 MAX_ROWS_PER_UPLOAD = 100
 RATE_LIMIT_SECONDS = 10
+PREVIEW_PAGE_SIZE = 20
 
 # PAGE CONFIGURATION
 st.set_page_config(
@@ -42,114 +38,31 @@ if 'app_initialized' not in st.session_state:
     st.session_state.generated_files = []
     st.session_state.last_subject = "English"
     st.session_state.last_year = 7
+    st.session_state.seed = 0
 
 # IMPORT STATEMENT FILES (directly from repository)
 try:
-    # English
-    from statements_year5_English import (
-        opening_phrases as opening_5_eng,
-        attitude_bank as attitude_5_eng,
-        reading_bank as reading_5_eng,
-        writing_bank as writing_5_eng,
-        reading_target_bank as target_5_eng,
-        writing_target_bank as target_write_5_eng,
-        closer_bank as closer_5_eng
+    from commentcraft import generate_comment, sanitize_input
+    from commentcraft.banks import BANDS, SUBJECTS, YEARS, check_template_sources
+    from commentcraft.jobs import CANCELLED, FAILED, BatchJob
+    from commentcraft.cache import COMMENT_CACHE
+    from commentcraft.ingest import normalize_roster, read_roster
+    from commentcraft.exports import (
+        CSV_MIME,
+        DOCX_MIME,
+        ZIP_MIME,
+        ExportCache,
+        export_filename,
     )
-    
-    from statements_year7_English import (
-        opening_phrases as opening_7_eng,
-        attitude_bank as attitude_7_eng,
-        reading_bank as reading_7_eng,
-        writing_bank as writing_7_eng,
-        reading_target_bank as target_7_eng,
-        writing_target_bank as target_write_7_eng,
-        closer_bank as closer_7_eng
-    )
-
-    from statements_year8_English import (
-        opening_phrases as opening_8_eng,
-        attitude_bank as attitude_8_eng,
-        reading_bank as reading_8_eng,
-        writing_bank as writing_8_eng,
-        reading_target_bank as target_8_eng,
-        writing_target_bank as target_write_8_eng,
-        closer_bank as closer_8_eng
-    )
-
-    # Science
-    from statements_year5_Science import (
-        opening_phrases as opening_5_sci,
-        attitude_bank as attitude_5_sci,
-        science_bank as science_5_sci,
-        target_bank as target_5_sci,
-        closer_bank as closer_5_sci
-    )
-    
-    from statements_year7_science import (
-        opening_phrases as opening_7_sci,
-        attitude_bank as attitude_7_sci,
-        science_bank as science_7_sci,
-        target_bank as target_7_sci,
-        closer_bank as closer_7_sci
-    )
-
-    from statements_year8_science import (
-        opening_phrases as opening_8_sci,
-        attitude_bank as attitude_8_sci,
-        science_bank as science_8_sci,
-        target_bank as target_8_sci,
-        closer_bank as closer_8_sci
-    )
-
-    # Maths
-    from statements_year5_Maths_NEW import (
-        opening_phrases as opening_5_math,
-        attitude_bank as attitude_5_math,
-        maths_bank as maths_5_math,
-        target_bank as target_5_math,
-        closer_bank as closer_5_math
-    )
-    
-    from statements_year7_Maths_NEW import (
-        opening_phrases as opening_7_math,
-        attitude_bank as attitude_7_math,
-        maths_bank as maths_7_math,
-        target_bank as target_7_math,
-        closer_bank as closer_7_math
-    )
-
-    from statements_year8_Maths_NEW import (
-        opening_phrases as opening_8_math,
-        attitude_bank as attitude_8_math,
-        maths_bank as maths_8_math,
-        target_bank as target_8_math,
-        closer_bank as closer_8_math
-    )
-    
-    # ESL (IGCSE)
-    from statements_igcse_0510_esl import (
-        opening_phrases as opening_esl,
-        attitude_bank as attitude_esl,
-        reading_bank as reading_esl,
-        writing_bank as writing_esl,
-        speaking_bank as speaking_esl,
-        listening_bank as listening_esl,
-        reading_target_bank as target_reading_esl,
-        writing_target_bank as target_write_esl,
-        speaking_target_bank as target_speak_esl,
-        listening_target_bank as target_listen_esl,
-        closer_bank as closer_esl
-    )
-
-    # Chemistry
-    from statements_igcse_0620_chemistry import (
-        opening_phrases as opening_chem,
-        attitude_bank as attitude_chem,
-        chemistry_bank as chemistry_chem,
-        target_bank as target_chem,
-        closer_bank as closer_chem
-    )
-
+    from commentcraft.reload import hot_reload_enabled, start_bank_watcher
+    from commentcraft.snapshot import load_snapshot
+    from commentcraft.store import CommentStore
+    # Banks load on first use, so make sure every module is there up front
+    check_template_sources()
+    if FAST_START:
+        load_snapshot()
+    # One watcher per server process reloads edited banks in place
+    bank_watcher = start_bank_watcher() if hot_reload_enabled() else None
 except ImportError as e:
     st.error(f"Missing required statement files: {e}")
     st.error("Please ensure all statement files are in the repository.")
@@ -165,13 +78,6 @@ def validate_upload_rate():
         return False
     return True
 
-def sanitize_input(text, max_length=100):
-    """Sanitize user input to prevent injection attacks"""
-    if not text:
-        return ""
-    sanitized = ''.join(c for c in text if c.isalnum() or c in " .'-")
-    return sanitized[:max_length].strip().title()
-
 def validate_file(file):
     """Validate uploaded file size and type"""
     if file.size > MAX_FILE_SIZE_MB * 1024 * 1024:
@@ -183,438 +89,19 @@ def validate_file(file):
     return True, ""
 
 def process_csv_securely(uploaded_file):
-    """Process CSV with auto-cleanup of temp files"""
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv', mode='wb') as tmp:
-        tmp.write(uploaded_file.getvalue())
-        temp_path = tmp.name
-    
+    """Parse the upload in memory; nothing is written to disk"""
     try:
-        df = pd.read_csv(temp_path, nrows=MAX_ROWS_PER_UPLOAD + 1)
+        df, truncated = read_roster(uploaded_file, max_rows=MAX_ROWS_PER_UPLOAD)
         
-        if len(df) > MAX_ROWS_PER_UPLOAD:
+        if truncated:
             st.warning(f"Only processing first {MAX_ROWS_PER_UPLOAD} rows")
-            df = df.head(MAX_ROWS_PER_UPLOAD)
-        
-        if 'Student Name' in df.columns:
-            df['Student Name'] = df['Student Name'].apply(lambda x: sanitize_input(str(x)))
         
+        # Names are sanitized column-wise by normalize_roster
         return df
         
     except Exception as e:
         st.error(f"Error reading CSV: {e}")
         return None
-        
-    finally:
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
-
-# HELPER FUNCTIONS
-def get_pronouns(gender):
-    gender = gender.lower()
-    if gender == "male":
-        return "he", "his"
-    elif gender == "female":
-        return "she", "her"
-    return "they", "their"
-
-def lowercase_first(text):
-    return text[0].lower() + text[1:] if text else ""
-
-def truncate_comment(comment, target=TARGET_CHARS):
-    if len(comment) <= target:
-        return comment
-    truncated = comment[:target].rstrip(" ,;.")
-    if "." in truncated:
-        truncated = truncated[:truncated.rfind(".")+1]
-    return truncated
-
-def fix_sentence_capitalization(text):
-    """Fix lowercase letters after periods."""
-    if not text:
-        return text
-    # Simple fix: capitalize after periods
-    result = ""
-    capitalize_next = True
-    for char in text:
-        if capitalize_next and char.isalpha():
-            result += char.upper()
-            capitalize_next = False
-        else:
-            result += char
-        if char in ".!?":
-            capitalize_next = True
-    return result
-
-def fix_pronouns_in_text(text, pronoun, possessive):
-    """Fix gender pronouns in statement text"""
-    if not text:
-        return text
-    
-    # Fix pronouns with word boundaries
-    text = re.sub(r'\bhe\b', pronoun, text, flags=re.IGNORECASE)
-    text = re.sub(r'\bHe\b', pronoun.capitalize(), text)
-    text = re.sub(r'\bshe\b', pronoun, text, flags=re.IGNORECASE)
-    text = re.sub(r'\bShe\b', pronoun.capitalize(), text)
-    text = re.sub(r'\bhis\b', possessive, text, flags=re.IGNORECASE)
-    text = re.sub(r'\bHis\b', possessive.capitalize(), text)
-    text = re.sub(r'\bher\b', possessive, text, flags=re.IGNORECASE)
-    text = re.sub(r'\bHer\b', possessive.capitalize(), text)
-    text = re.sub(r'\bhim\b', pronoun, text, flags=re.IGNORECASE)
-    text = re.sub(r'\bHim\b', pronoun.capitalize(), text)
-    text = re.sub(r'\bhimself\b', f"{pronoun}self", text, flags=re.IGNORECASE)
-    text = re.sub(r'\bherself\b', f"{pronoun}self", text, flags=re.IGNORECASE)
-    
-    return text
-
-def generate_comment(subject, year, name, gender, att, achieve, target, optional_text=None):
-    """Generate a report comment based on subject, year, and performance bands"""
-    # Save the subject and year for next time
-    st.session_state.last_subject = subject
-    st.session_state.last_year = year
-    
-    p, p_poss = get_pronouns(gender)
-    name = sanitize_input(name)
-    
-    # Initialize comment parts
-    comment_parts = []
-    
-    # Subject-specific comment generation
-    if subject == "English":
-        if year == 5:
-            opening = random.choice(opening_5_eng)
-            attitude_text = fix_pronouns_in_text(attitude_5_eng[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            reading_text = fix_pronouns_in_text(reading_5_eng[achieve], p, p_poss)
-            if reading_text[0].islower():
-                reading_text = f"{p} {reading_text}"
-            reading_sentence = f"In reading, {reading_text}"
-            
-            writing_text = fix_pronouns_in_text(writing_5_eng[achieve], p, p_poss)
-            if writing_text[0].islower():
-                writing_text = f"{p} {writing_text}"
-            writing_sentence = f"In writing, {writing_text}"
-            
-            reading_target_text = fix_pronouns_in_text(target_5_eng[target], p, p_poss)
-            reading_target_sentence = f"For the next term, {p} should {lowercase_first(reading_target_text)}"
-            
-            writing_target_text = fix_pronouns_in_text(target_write_5_eng[target], p, p_poss)
-            writing_target_sentence = f"Additionally, {p} should {lowercase_first(writing_target_text)}"
-            
-            closer_sentence = random.choice(closer_5_eng)
-            
-            comment_parts = [
-                attitude_sentence,
-                reading_sentence,
-                writing_sentence,
-                reading_target_sentence,
-                writing_target_sentence,
-                closer_sentence
-            ]
-            
-        elif year == 7:
-            opening = random.choice(opening_7_eng)
-            attitude_text = fix_pronouns_in_text(attitude_7_eng[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            reading_text = fix_pronouns_in_text(reading_7_eng[achieve], p, p_poss)
-            if reading_text[0].islower():
-                reading_text = f"{p} {reading_text}"
-            reading_sentence = f"In reading, {reading_text}"
-            
-            writing_text = fix_pronouns_in_text(writing_7_eng[achieve], p, p_poss)
-            if writing_text[0].islower():
-                writing_text = f"{p} {writing_text}"
-            writing_sentence = f"In writing, {writing_text}"
-            
-            reading_target_text = fix_pronouns_in_text(target_7_eng[target], p, p_poss)
-            reading_target_sentence = f"For the next term, {p} should {lowercase_first(reading_target_text)}"
-            
-            writing_target_text = fix_pronouns_in_text(target_write_7_eng[target], p, p_poss)
-            writing_target_sentence = f"Additionally, {p} should {lowercase_first(writing_target_text)}"
-            
-            closer_sentence = random.choice(closer_7_eng)
-            
-            comment_parts = [
-                attitude_sentence,
-                reading_sentence,
-                writing_sentence,
-                reading_target_sentence,
-                writing_target_sentence,
-                closer_sentence
-            ]
-            
-        else:  # Year 8
-            opening = random.choice(opening_8_eng)
-            attitude_text = fix_pronouns_in_text(attitude_8_eng[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            reading_text = fix_pronouns_in_text(reading_8_eng[achieve], p, p_poss)
-            if reading_text[0].islower():
-                reading_text = f"{p} {reading_text}"
-            reading_sentence = f"In reading, {reading_text}"
-            
-            writing_text = fix_pronouns_in_text(writing_8_eng[achieve], p, p_poss)
-            if writing_text[0].islower():
-                writing_text = f"{p} {writing_text}"
-            writing_sentence = f"In writing, {writing_text}"
-            
-            reading_target_text = fix_pronouns_in_text(target_8_eng[target], p, p_poss)
-            reading_target_sentence = f"For the next term, {p} should {lowercase_first(reading_target_text)}"
-            
-            writing_target_text = fix_pronouns_in_text(target_write_8_eng[target], p, p_poss)
-            writing_target_sentence = f"Additionally, {p} should {lowercase_first(writing_target_text)}"
-            
-            closer_sentence = random.choice(closer_8_eng)
-            
-            comment_parts = [
-                attitude_sentence,
-                reading_sentence,
-                writing_sentence,
-                reading_target_sentence,
-                writing_target_sentence,
-                closer_sentence
-            ]
-        
-    elif subject == "Science":
-        if year == 5:
-            opening = random.choice(opening_5_sci)
-            attitude_text = fix_pronouns_in_text(attitude_5_sci[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            science_text = fix_pronouns_in_text(science_5_sci[achieve], p, p_poss)
-            if science_text[0].islower():
-                science_text = f"{p} {science_text}"
-            science_sentence = science_text
-            
-            target_text = fix_pronouns_in_text(target_5_sci[target], p, p_poss)
-            target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-            
-            closer_sentence = random.choice(closer_5_sci)
-            
-            comment_parts = [
-                attitude_sentence,
-                science_sentence,
-                target_sentence,
-                closer_sentence
-            ]
-            
-        elif year == 7:
-            opening = random.choice(opening_7_sci)
-            attitude_text = fix_pronouns_in_text(attitude_7_sci[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            science_text = fix_pronouns_in_text(science_7_sci[achieve], p, p_poss)
-            if science_text[0].islower():
-                science_text = f"{p} {science_text}"
-            science_sentence = science_text
-            
-            target_text = fix_pronouns_in_text(target_7_sci[target], p, p_poss)
-            target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-            
-            closer_sentence = random.choice(closer_7_sci)
-            
-            comment_parts = [
-                attitude_sentence,
-                science_sentence,
-                target_sentence,
-                closer_sentence
-            ]
-            
-        else:  # Year 8
-            opening = random.choice(opening_8_sci)
-            attitude_text = fix_pronouns_in_text(attitude_8_sci[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            science_text = fix_pronouns_in_text(science_8_sci[achieve], p, p_poss)
-            if science_text[0].islower():
-                science_text = f"{p} {science_text}"
-            science_sentence = science_text
-            
-            target_text = fix_pronouns_in_text(target_8_sci[target], p, p_poss)
-            target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-            
-            closer_sentence = random.choice(closer_8_sci)
-            
-            comment_parts = [
-                attitude_sentence,
-                science_sentence,
-                target_sentence,
-                closer_sentence
-            ]
-        
-    elif subject == "Maths":
-        if year == 5:
-            opening = random.choice(opening_5_math)
-            attitude_text = fix_pronouns_in_text(attitude_5_math[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            maths_text = fix_pronouns_in_text(maths_5_math[achieve], p, p_poss)
-            if maths_text[0].islower():
-                maths_text = f"{p} {maths_text}"
-            maths_sentence = maths_text
-            
-            target_text = fix_pronouns_in_text(target_5_math[target], p, p_poss)
-            target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-            
-            closer_sentence = random.choice(closer_5_math)
-            
-            comment_parts = [
-                attitude_sentence,
-                maths_sentence,
-                target_sentence,
-                closer_sentence
-            ]
-            
-        elif year == 7:
-            opening = random.choice(opening_7_math)
-            attitude_text = fix_pronouns_in_text(attitude_7_math[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            maths_text = fix_pronouns_in_text(maths_7_math[achieve], p, p_poss)
-            if maths_text[0].islower():
-                maths_text = f"{p} {maths_text}"
-            maths_sentence = maths_text
-            
-            target_text = fix_pronouns_in_text(target_7_math[target], p, p_poss)
-            target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-            
-            closer_sentence = random.choice(closer_7_math)
-            
-            comment_parts = [
-                attitude_sentence,
-                maths_sentence,
-                target_sentence,
-                closer_sentence
-            ]
-            
-        else:  # Year 8
-            opening = random.choice(opening_8_math)
-            attitude_text = fix_pronouns_in_text(attitude_8_math[att], p, p_poss)
-            attitude_sentence = f"{opening} {name} {attitude_text}"
-            
-            maths_text = fix_pronouns_in_text(maths_8_math[achieve], p, p_poss)
-            if maths_text[0].islower():
-                maths_text = f"{p} {maths_text}"
-            maths_sentence = maths_text
-            
-            target_text = fix_pronouns_in_text(target_8_math[target], p, p_poss)
-            target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-            
-            closer_sentence = random.choice(closer_8_math)
-            
-            comment_parts = [
-                attitude_sentence,
-                maths_sentence,
-                target_sentence,
-                closer_sentence
-            ]
-        
-    elif subject == "ESL (IGCSE)":
-        opening = random.choice(opening_esl)
-        attitude_text = fix_pronouns_in_text(attitude_esl[att], p, p_poss)
-        attitude_sentence = f"{opening} {name} {attitude_text}"
-        
-        # Reading
-        reading_text = fix_pronouns_in_text(reading_esl[achieve], p, p_poss)
-        if reading_text[0].islower():
-            reading_text = f"{p} {reading_text}"
-        reading_sentence = f"In reading, {reading_text}"
-        
-        # Writing
-        writing_text = fix_pronouns_in_text(writing_esl[achieve], p, p_poss)
-        if writing_text[0].islower():
-            writing_text = f"{p} {writing_text}"
-        writing_sentence = f"In writing, {writing_text}"
-        
-        # Speaking
-        speaking_text = fix_pronouns_in_text(speaking_esl[achieve], p, p_poss)
-        if speaking_text[0].islower():
-            speaking_text = f"{p} {speaking_text}"
-        speaking_sentence = f"In speaking, {speaking_text}"
-        
-        # Listening
-        listening_text = fix_pronouns_in_text(listening_esl[achieve], p, p_poss)
-        if listening_text[0].islower():
-            listening_text = f"{p} {listening_text}"
-        listening_sentence = f"In listening, {listening_text}"
-        
-        # Targets
-        reading_target_text = fix_pronouns_in_text(target_reading_esl[target], p, p_poss)
-        reading_target_sentence = f"For the next term, {p} should {lowercase_first(reading_target_text)}"
-        
-        writing_target_text = fix_pronouns_in_text(target_write_esl[target], p, p_poss)
-        writing_target_sentence = f"Additionally, {p} should {lowercase_first(writing_target_text)}"
-        
-        closer_sentence = random.choice(closer_esl)
-        
-        comment_parts = [
-            attitude_sentence,
-            reading_sentence,
-            writing_sentence,
-            speaking_sentence,
-            listening_sentence,
-            reading_target_sentence,
-            writing_target_sentence,
-            closer_sentence
-        ]
-        
-    elif subject == "Chemistry":
-        opening = random.choice(opening_chem)
-        attitude_text = fix_pronouns_in_text(attitude_chem[att], p, p_poss)
-        attitude_sentence = f"{opening} {name} {attitude_text}"
-        
-        chemistry_text = fix_pronouns_in_text(chemistry_chem[achieve], p, p_poss)
-        if chemistry_text[0].islower():
-            chemistry_text = f"{p} {chemistry_text}"
-        chemistry_sentence = chemistry_text
-        
-        target_text = fix_pronouns_in_text(target_chem[target], p, p_poss)
-        target_sentence = f"For the next term, {p} should {lowercase_first(target_text)}"
-        
-        closer_sentence = random.choice(closer_chem)
-        
-        comment_parts = [
-            attitude_sentence,
-            chemistry_sentence,
-            target_sentence,
-            closer_sentence
-        ]
-    
-    else:
-        # Default fallback if subject not recognized
-        comment_parts = [f"{name} has worked in {subject} this term."]
-    
-    # Add optional text if provided - NOW AT THE END
-    if optional_text:
-        optional_text = sanitize_input(optional_text)
-        if optional_text:
-            optional_sentence = f"Additionally, {lowercase_first(optional_text)}"
-            if not optional_sentence.endswith('.'):
-                optional_sentence += '.'
-            # Insert before the closer sentence (second to last position)
-            if comment_parts:
-                comment_parts.insert(-1, optional_sentence)
-            else:
-                comment_parts.append(optional_sentence)
-    
-    # Ensure all sentences end with period
-    for i in range(len(comment_parts)):
-        if not comment_parts[i].endswith('.'):
-            comment_parts[i] += '.'
-    
-    # Join comment parts
-    comment = " ".join([c for c in comment_parts if c])
-    
-    # FIX: Apply sentence capitalization
-    comment = fix_sentence_capitalization(comment)
-    
-    # Truncate to target length
-    comment = truncate_comment(comment, TARGET_CHARS)
-    
-    return comment
 
 # STREAMLIT APP LAYOUT
 
@@ -628,17 +115,27 @@ with st.sidebar:
         ["Single Student", "Batch Upload", "Privacy Info"]
     )
     
+    st.number_input(
+        "Comment seed",
+        min_value=0,
+        step=1,
+        key='seed',
+        help="The same seed always gives a student the same comment; change it for different wording"
+    )
+    
     st.markdown("---")
     st.markdown("### Privacy Features")
     st.info("""
     - No data stored on servers
     - All processing in memory
-    - Auto-deletion of temp files
+    - No temporary files
     - Input sanitization
     - Rate limiting enabled
     """)
     
     if st.button("Clear All Data", type="secondary", use_container_width=True):
+        if st.session_state.get('batch_job') is not None:
+            st.session_state.batch_job.cancel()
         st.session_state.clear()
         st.session_state.app_initialized = True
         st.session_state.upload_count = 0
@@ -662,33 +159,33 @@ if app_mode == "Single Student":
     st.subheader("Single Student Entry")
     
     # Use session state values as defaults
-    default_subject_index = ["English", "Maths", "Science", "ESL (IGCSE)", "Chemistry"].index(st.session_state.last_subject)
-    default_year_index = [5, 7, 8, 10, 11].index(st.session_state.last_year)
+    default_subject_index = SUBJECTS.index(st.session_state.last_subject)
+    default_year_index = YEARS.index(st.session_state.last_year)
     
     with st.form("single_student_form", clear_on_submit=True):
         col1, col2 = st.columns(2)
         
         with col1:
             subject = st.selectbox("Subject", 
-                                 ["English", "Maths", "Science", "ESL (IGCSE)", "Chemistry"],
+                                 SUBJECTS,
                                  index=default_subject_index)
             year = st.selectbox("Year", 
-                              [5, 7, 8, 10, 11],
+                              YEARS,
                               index=default_year_index)
             name = st.text_input("Student Name", placeholder="Enter first name only")
             gender = st.selectbox("Gender", ["Male", "Female"])
         
         with col2:
             att = st.selectbox("Attitude Band", 
-                             options=[90,85,80,75,70,65,60,55,40],
+                             options=BANDS,
                              index=3)
             
             achieve = st.selectbox("Achievement Band",
-                                 options=[90,85,80,75,70,65,60,55,40],
+                                 options=BANDS,
                                  index=3)
             
             target = st.selectbox("Target Band",
-                                options=[90,85,80,75,70,65,60,55,40],
+                                options=BANDS,
                                 index=3)
         
         attitude_target = st.text_area("Optional Additional Comment",
@@ -703,6 +200,10 @@ if app_mode == "Single Student":
         
         name = sanitize_input(name)
         
+        # Save the subject and year for next time
+        st.session_state.last_subject = subject
+        st.session_state.last_year = year
+        
         with st.spinner("Generating comment..."):
             comment = generate_comment(
                 subject=subject,
@@ -712,7 +213,9 @@ if app_mode == "Single Student":
                 att=att,
                 achieve=achieve,
                 target=target,
-                optional_text=attitude_target
+                optional_text=attitude_target,
+                name_sanitized=True,
+                seed=st.session_state.seed
             )
             char_count = len(comment)
         
@@ -734,7 +237,7 @@ if app_mode == "Single Student":
         
         # Store in session
         if 'all_comments' not in st.session_state:
-            st.session_state.all_comments = []
+            st.session_state.all_comments = CommentStore()
         
         student_entry = {
             'name': name,
@@ -753,13 +256,13 @@ if app_mode == "Single Student":
 elif app_mode == "Batch Upload":
     st.subheader("Batch Upload (CSV)")
     
-    st.info("""
+    st.info(f"""
     **CSV Format Required:**
     - Columns: Student Name, Gender, Subject, Year, Attitude, Achievement, Target
     - Gender: Male/Female
-    - Subject: English/Maths/Science/ESL (IGCSE)/Chemistry
-    - Year: 5,7,8,10,11
-    - Bands: 90,85,80,75,70,65,60,55,40
+    - Subject: {'/'.join(SUBJECTS)}
+    - Year: {','.join(map(str, YEARS))}
+    - Attitude/Achievement/Target: bands {','.join(map(str, BANDS))} or any score from 0 to 100
     """)
     
     # Example CSV
@@ -779,8 +282,11 @@ Maria,Female,Chemistry,11,80,85,80"""
     uploaded_file = st.file_uploader("Choose CSV file", type=['csv'])
     
     if uploaded_file:
-        if not validate_upload_rate():
-            st.stop()
+        # Only a new upload is rate limited, so reruns while a batch job runs are not blocked
+        if uploaded_file.file_id != st.session_state.get('last_upload_id'):
+            if not validate_upload_rate():
+                st.stop()
+            st.session_state.last_upload_id = uploaded_file.file_id
         
         is_valid, msg = validate_file(uploaded_file)
         if not is_valid:
@@ -791,46 +297,28 @@ Maria,Female,Chemistry,11,80,85,80"""
             df = process_csv_securely(uploaded_file)
         
         if df is not None:
+            df, rejected = normalize_roster(df)
             st.success(f"Processed {len(df)} students")
             
+            if len(rejected):
+                st.warning(f"{len(rejected)} row(s) have invalid values and will be skipped")
+                with st.expander("Rejected Rows"):
+                    st.dataframe(rejected)
+            
             with st.expander("Preview Data"):
                 st.dataframe(df.head())
             
-            if st.button("Generate All Comments"):
+            job = st.session_state.get('batch_job')
+            if st.button("Generate All Comments", disabled=job is not None and not job.finished):
                 if 'all_comments' not in st.session_state:
-                    st.session_state.all_comments = []
+                    st.session_state.all_comments = CommentStore()
                 
-                progress_bar = st.progress(0)
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
                 
-                for idx, row in df.iterrows():
-                    progress = (idx + 1) / len(df)
-                    progress_bar.progress(progress)
-                    
-                    try:
-                        comment = generate_comment(
-                            subject=str(row.get('Subject', 'English')),
-                            year=int(row.get('Year', 7)),
-                            name=str(row.get('Student Name', '')),
-                            gender=str(row.get('Gender', '')),
-                            att=int(row.get('Attitude', 75)),
-                            achieve=int(row.get('Achievement', 75)),
-                            target=int(row.get('Target', 75))
-                        )
-                        
-                        student_entry = {
-                            'name': sanitize_input(str(row.get('Student Name', ''))),
-                            'subject': str(row.get('Subject', 'English')),
-                            'year': int(row.get('Year', 7)),
-                            'comment': comment,
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M")
-                        }
-                        st.session_state.all_comments.append(student_entry)
-                        
-                    except Exception as e:
-                        st.error(f"Error processing row {idx + 1}: {e}")
-                
-                progress_bar.empty()
-                st.success(f"Generated {len(df)} comments!")
+                # Runs in the background; each student is seeded from the student and
+                # seed, same as the command-line batch run
+                job = BatchJob(df.to_dict('records'), timestamp, st.session_state.seed)
+                st.session_state.batch_job = job.start()
                 st.session_state.last_upload_time = datetime.now()
 
 # PRIVACY INFO MODE
@@ -843,14 +331,14 @@ elif app_mode == "Privacy Info":
     **How we handle data:**
     - All processing occurs in your browser's memory
     - No student data is sent to external servers
-    - Temporary files are created and immediately deleted
+    - Uploaded files are parsed in memory and never written to disk
     - No database or persistent storage is used
     
     **Security features:**
     1. **Input Sanitization** - Removes special characters
     2. **Rate Limiting** - Prevents system abuse
     3. **File Validation** - Checks file size and type
-    4. **Auto-Cleanup** - Temporary files automatically deleted
+    4. **No Temp Files** - Uploads never touch the server disk
     5. **Memory Clearing** - All data erased on browser close
     
     **Best practices:**
@@ -860,6 +348,45 @@ elif app_mode == "Privacy Info":
     - Use on school-managed devices for maximum privacy
     """)
 
+# BATCH JOB STATUS
+# Polls the session's background batch job every second without rerunning the
+# page, moving finished comments into all_comments as they arrive
+@st.fragment(run_every=1)
+def batch_job_status():
+    job = st.session_state.get('batch_job')
+    if job is None:
+        return
+    entries = job.take_entries()
+    if entries:
+        st.session_state.all_comments.extend(entries)
+    
+    if not job.finished:
+        st.progress(job.progress_fraction, text=f"Batch job {job.id}: {job.progress_text}")
+        if st.button("Cancel Batch", key='cancel_batch_job'):
+            job.cancel()
+        return
+    
+    # Finished: report once, then rerun the page so the downloads include the new comments
+    st.session_state.batch_job_report = job
+    del st.session_state.batch_job
+    st.rerun(scope="app")
+
+if 'batch_job' in st.session_state:
+    batch_job_status()
+
+if 'batch_job_report' in st.session_state:
+    job = st.session_state.pop('batch_job_report')
+    for error in job.errors:
+        st.error(error)
+    if job.status == FAILED:
+        st.error(f"Batch job {job.id} failed: {job.failure}")
+    elif job.status == CANCELLED:
+        st.warning(f"Batch job {job.id} cancelled: generated {job.generated} of {job.total} comments "
+                   f"({job.summary()})")
+    else:
+        st.success(f"Generated {job.generated} comments!")
+        st.caption(f"Batch job {job.id}: {job.summary()}")
+
 # DOWNLOAD SECTION
 if 'all_comments' in st.session_state and st.session_state.all_comments:
     st.markdown("---")
@@ -869,66 +396,92 @@ if 'all_comments' in st.session_state and st.session_state.all_comments:
     st.info(f"You have {total_comments} generated comment(s)")
     
     # Preview
+    # Only one page of matching comments is rendered per rerun
     with st.expander(f"Preview Comments ({total_comments})"):
-        for idx, entry in enumerate(st.session_state.all_comments, 1):
-            st.markdown(f"**{idx}. {entry['name']}** ({entry['subject']} Year {entry['year']})")
+        comments = st.session_state.all_comments
+        filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+        with filter_col1:
+            preview_subject = st.selectbox("Subject", ["All"] + comments.present_subjects(), key='preview_subject')
+        with filter_col2:
+            preview_year = st.selectbox("Year", ["All"] + comments.years(), key='preview_year')
+        with filter_col3:
+            preview_name = st.text_input("Name contains", max_chars=100, key='preview_name')
+        with filter_col4:
+            preview_query = st.text_input("Search comments", max_chars=100, key='preview_query')
+        
+        matches = comments.matches(
+            subject=None if preview_subject == "All" else preview_subject,
+            year=None if preview_year == "All" else preview_year,
+            name=sanitize_input(preview_name),
+            query=preview_query
+        )
+        page_count = max(1, -(-len(matches) // PREVIEW_PAGE_SIZE))
+        page = min(st.number_input("Page", min_value=1, step=1, key='preview_page'), page_count)
+        first = (page - 1) * PREVIEW_PAGE_SIZE
+        st.caption(f"Showing {min(first + 1, len(matches))}-{min(first + PREVIEW_PAGE_SIZE, len(matches))} "
+                   f"of {len(matches)} matching comment(s), page {page} of {page_count}")
+        
+        for idx in matches[first:first + PREVIEW_PAGE_SIZE]:
+            entry = comments[idx]
+            st.markdown(f"**{idx + 1}. {entry['name']}** ({entry['subject']} Year {entry['year']})")
             st.write(entry['comment'])
             st.markdown("---")
     
     # Download options
-    col1, col2, col3 = st.columns(3)
+    # Files are built on download; Word and CSV files are reused until the comments change
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = ExportCache()
+    export_cache = st.session_state.export_cache
+    comments_version = st.session_state.all_comments.version
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if st.button("Word Document"):
-            doc = Document()
-            doc.add_heading('Report Comments', 0)
-            doc.add_paragraph(f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}')
-            doc.add_paragraph(f'Total Students: {total_comments}')
-            doc.add_paragraph('')
-            
-            for entry in st.session_state.all_comments:
-                doc.add_heading(f"{entry['name']} - {entry['subject']} Year {entry['year']}", level=2)
-                doc.add_paragraph(entry['comment'])
-                doc.add_paragraph('')
-            
-            bio = io.BytesIO()
-            doc.save(bio)
-            
-            st.download_button(
-                label="Download Word File",
-                data=bio.getvalue(),
-                file_name=f"report_comments_{datetime.now().strftime('%Y%m%d_%H%M')}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
+        st.download_button(
+            label="Word Document",
+            data=export_cache.builder('docx', st.session_state.all_comments, comments_version),
+            file_name=export_filename("docx"),
+            mime=DOCX_MIME,
+            on_click="ignore"
+        )
     
     with col2:
-        if st.button("CSV Export"):
-            csv_data = []
-            for entry in st.session_state.all_comments:
-                csv_data.append({
-                    'Student Name': entry['name'],
-                    'Subject': entry['subject'],
-                    'Year': entry['year'],
-                    'Comment': entry['comment'],
-                    'Generated': entry['timestamp']
-                })
-            
-            df_export = pd.DataFrame(csv_data)
-            csv_bytes = df_export.to_csv(index=False).encode('utf-8')
-            
-            st.download_button(
-                label="Download CSV",
-                data=csv_bytes,
-                file_name=f"report_comments_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="CSV Export",
+            data=export_cache.builder('csv', st.session_state.all_comments, comments_version),
+            file_name=export_filename("csv"),
+            mime=CSV_MIME,
+            on_click="ignore"
+        )
     
     with col3:
+        st.download_button(
+            label="Student Pack (ZIP)",
+            data=export_cache.builder('zip', st.session_state.all_comments, comments_version),
+            file_name=export_filename("zip"),
+            mime=ZIP_MIME,
+            on_click="ignore"
+        )
+    
+    with col4:
         if st.button("Clear All", type="secondary"):
-            st.session_state.all_comments = []
+            st.session_state.all_comments.clear()
             st.success("All comments cleared!")
             st.rerun()
 
+# CACHE STATS
+# The comment cache is shared by every session, so these are server-wide
+cache_stats = COMMENT_CACHE.stats()
+with st.sidebar:
+    st.markdown("---")
+    st.caption(
+        f"Comment cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+        f"({cache_stats['hit_rate']:.0%} hit rate), "
+        f"{cache_stats['size']}/{cache_stats['maxsize']} entries"
+    )
+    if bank_watcher is not None and bank_watcher.last_errors:
+        st.warning("Some edited statement banks could not be reloaded; the previous version is still in use: "
+                   + "; ".join(f"{source}: {error}" for source, error in bank_watcher.last_errors))
+
 # FOOTER
 st.markdown("---")
 st.caption("CommentCraft v4.0 • Secure & Private")
@@ -0,0 +1,96 @@
+# HEADLESS BATCH GENERATOR
+# Generates report comments for a whole roster CSV without Streamlit, using
+# the same comment engine as the app. Intended for cron / whole-school runs,
+# so there is no row limit. Rows are spread over worker processes; each
+# student's comment is seeded from the student and --seed, so reruns give the
+# same text and a different --seed gives fresh wording.
+#
+# Usage:
+#   python batch_generate.py roster.csv -o comments.csv
+#   python batch_generate.py roster.csv -o comments.docx --workers 4
+#   python batch_generate.py roster.csv -o reports.zip   (one .docx per student)
+#   python batch_generate.py roster.csv -o comments.csv --seed 2
+#   python batch_generate.py roster.csv -o comments.csv --snapshot commentcraft/banks.snapshot
+#
+# The roster uses the app's batch upload columns:
+#   Student Name, Gender, Subject, Year, Attitude, Achievement, Target
+# Rows that fail validation are listed on stderr and skipped. Progress
+# (rows/s and ETA, at most twice a second) and a timing summary also go to
+# stderr; --quiet turns them off.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from commentcraft.batch import generate_batch
+from commentcraft.exports import comments_to_csv, export_timestamp, write_docx, write_docx_pack
+from commentcraft.ingest import UPLOAD_ROW_COLUMN, normalize_roster, read_roster
+from commentcraft.progress import ProgressMeter
+
+OUTPUT_FORMATS = ("csv", "docx", "zip")
+
+def output_format(path, requested=None):
+    fmt = requested or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format {fmt!r} (use .csv, .docx or .zip)")
+    return fmt
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate report comments from a roster CSV")
+    parser.add_argument("roster", help="input roster CSV")
+    parser.add_argument("-o", "--output", required=True, help="output file (.csv, .docx, or .zip for one .docx per student)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="output format (default: from extension)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="comment variant to generate (default: 0)")
+    parser.add_argument("--quiet", action="store_true", help="no progress or timing output")
+    parser.add_argument("--snapshot", help="compiled bank snapshot for the workers to share (python manage_banks.py compile)")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = output_format(args.output, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    df, _ = read_roster(args.roster)
+    roster, rejected = normalize_roster(df)
+    for row, reason in zip(rejected[UPLOAD_ROW_COLUMN], rejected['Reason']):
+        print(f"Rejected row {row}: {reason}", file=sys.stderr)
+
+    meter = ProgressMeter(len(roster))
+    interactive = sys.stderr.isatty()
+
+    def report(done):
+        if not args.quiet and meter.update(done):
+            print(f"\r{meter.status()}" if interactive else meter.status(), end='' if interactive else '\n',
+                  file=sys.stderr, flush=True)
+
+    entries, errors = generate_batch(
+        roster.to_dict('records'), export_timestamp(), workers=args.workers, seed=args.seed,
+        snapshot=args.snapshot, progress=report
+    )
+    meter.stop()
+    if interactive and meter.reports and not args.quiet:
+        print(file=sys.stderr)
+    for error in errors:
+        print(error, file=sys.stderr)
+
+    export_started = time.perf_counter()
+    with open(args.output, 'wb') as f:
+        if fmt == "docx":
+            write_docx(entries, f)
+        elif fmt == "zip":
+            write_docx_pack(entries, f, args.workers)
+        else:
+            f.write(comments_to_csv(entries))
+    export_seconds = time.perf_counter() - export_started
+
+    print(f"Generated {len(entries)} of {len(df)} comments -> {args.output}")
+    if not args.quiet:
+        print(f"Timing: generated {meter.summary()}; wrote {fmt} in {export_seconds:.2f} s", file=sys.stderr)
+    return 1 if errors or len(rejected) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# STATEMENT BANK IMPORT BENCHMARK
+# Times how long the comment engine takes to become usable in a fresh
+# interpreter: loading every statement bank up front against loading only
+# the bank for the first subject/year a teacher selects. Each measurement
+# runs in its own subprocess.
+#
+# Usage: python benchmarks/bench_import.py [--repeat N] [--cold] [--subject Maths --year 7]
+#
+# --cold compiles the statement modules from source every run (no .pyc
+# files), like a fresh container with bytecode writing disabled.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "all banks": """
+from commentcraft.banks import load_all_templates
+load_all_templates()
+""",
+    "first selection": """
+from commentcraft import get_template
+get_template({subject!r}, {year!r})
+""",
+}
+
+RUNNER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{body}
+loaded = time.perf_counter()
+from commentcraft import get_template
+for _ in range(1000):
+    get_template({subject!r}, {year!r})
+done = time.perf_counter()
+print(json.dumps({{"load": loaded - start, "lookup": (done - loaded) / 1000,
+                   "modules": sum(name.startswith("statements_") for name in sys.modules)}}))
+"""
+
+def run_scenario(body, subject, year, cold, scratch_dir):
+    code = RUNNER.format(root=REPO_ROOT, body=body.format(subject=subject, year=year), subject=subject, year=year)
+    env = dict(os.environ)
+    args = [sys.executable]
+    if cold:
+        # Empty bytecode cache, nothing written back
+        env["PYTHONPYCACHEPREFIX"] = tempfile.mkdtemp(prefix="bench-import-", dir=scratch_dir)
+        args.append("-B")
+    output = subprocess.run(args + ["-c", code], env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Statement bank import benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="subprocess runs per scenario (best is reported)")
+    parser.add_argument("--cold", action="store_true", help="compile statement modules from source every run")
+    parser.add_argument("--subject", default="Maths")
+    parser.add_argument("--year", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        print(f"First selection: {args.subject} Year {args.year} ({'cold' if args.cold else 'warm'} bytecode cache)")
+        for name, body in SCENARIOS.items():
+            runs = [run_scenario(body, args.subject, args.year, args.cold, scratch) for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run["load"])
+            print(f"{name:16} load {best['load'] * 1e3:8.2f} ms   "
+                  f"cached lookup {best['lookup'] * 1e6:6.2f} us   "
+                  f"statement modules {best['modules']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# APP STARTUP BENCHMARK
+# Time-to-first-render of app_fixed.py in a fresh interpreter, in the default
+# mode (bytecode writing disabled, banks imported from source on first use)
+# and in fast-start mode (bytecode kept, banks loaded from the snapshot).
+# Also times the first generated comment, which is when banks are needed.
+# Each run is its own subprocess driven by Streamlit's AppTest.
+#
+# Usage: python benchmarks/bench_startup.py [--repeat N] [--cold] [--app app_fixed.py]
+#
+# --cold starts every run with an empty bytecode cache, like a new container.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fast_start import FAST_START_ENV
+
+RUNNER = """
+import datetime, json, os, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+os.chdir({root!r})
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+rendered = time.perf_counter()
+at.session_state["last_upload_time"] = datetime.datetime(2000, 1, 1)
+at.text_input[0].input("Alex")
+at.button[0].click()
+at.run()
+commented = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({{"streamlit": imported - start, "first_render": rendered - imported,
+                   "first_comment": commented - rendered}}))
+"""
+
+def run_app(app, fast_start, cold, snapshot_dir):
+    env = dict(os.environ)
+    env.pop(FAST_START_ENV, None)
+    if fast_start:
+        env[FAST_START_ENV] = "1"
+    if cold:
+        env["PYTHONPYCACHEPREFIX"] = tempfile.mkdtemp(prefix="bench-startup-", dir=snapshot_dir)
+    code = RUNNER.format(root=REPO_ROOT, app=os.path.join(REPO_ROOT, app))
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="App time-to-first-render benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode (best is reported)")
+    parser.add_argument("--cold", action="store_true", help="empty bytecode cache for every run")
+    parser.add_argument("--app", default="app_fixed.py")
+    args = parser.parse_args()
+
+    from commentcraft.snapshot import SNAPSHOT_PATH, build_snapshot
+    if not os.path.exists(SNAPSHOT_PATH):
+        build_snapshot()
+        print(f"Built {SNAPSHOT_PATH}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        print(f"{args.app} ({'cold' if args.cold else 'warm'} bytecode cache)")
+        for label, fast_start in (("default", False), ("fast start", True)):
+            runs = [run_app(args.app, fast_start, args.cold, scratch) for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run["first_render"])
+            print(f"{label:10}  streamlit import {best['streamlit'] * 1e3:8.1f} ms   "
+                  f"first render {best['first_render'] * 1e3:8.1f} ms   "
+                  f"first comment {best['first_comment'] * 1e3:8.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+# BENCHMARK SUITE
+# Times the comment engine, roster ingestion and the exports, saves the
+# results as a JSON baseline and compares a run against a saved baseline.
+#
+#   engine/<subject>/<year>   generate_comment for every subject/year, uncached
+#   engine/cohort/uncached    a banded cohort across every subject/year, uncached
+#   engine/cohort/cached      the same cohort through a fresh comment cache
+#   ingest/<rows>             read_roster + normalize_roster on a CSV
+#   export/docx/<rows>        comments_to_docx
+#   export/csv/<rows>         comments_to_csv
+#
+# Usage:
+#   python benchmarks/bench_suite.py --save benchmarks/baseline.json
+#   python benchmarks/bench_suite.py --compare benchmarks/baseline.json [--threshold 0.2]
+#   python benchmarks/bench_suite.py --only export/docx --sizes 100 1000
+#
+# Each benchmark reports the best of --repeat runs. With --compare, a
+# benchmark more than --threshold slower than the baseline is flagged as a
+# regression and the exit status is 1. Baselines are only comparable on the
+# same machine and Python.
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from commentcraft import generate_comment
+from commentcraft.banks import BANDS, SUBJECT_YEARS, load_all_templates
+from commentcraft.cache import CommentCache
+from commentcraft.exports import comments_to_csv, comments_to_docx
+from commentcraft.ingest import normalize_roster, read_roster
+
+SIZES = (100, 1000, 10000, 100000)
+ENGINE_CALLS = 200
+COHORT_SIZE = 5000
+DEFAULT_THRESHOLD = 0.2
+GENDERS = ("Male", "Female")
+ROSTER_COLUMNS = "Student Name,Gender,Subject,Year,Attitude,Achievement,Target"
+
+# INPUTS
+# Seeded, so every run and every baseline times the same work
+def engine_calls(subject, year, count=ENGINE_CALLS, seed=0):
+    """Keyword arguments for count generate_comment calls"""
+    rng = random.Random(f"{subject}|{year}|{seed}")
+    return [{
+        'subject': subject,
+        'year': year,
+        'name': f"Student{rng.randrange(count)}",
+        'gender': rng.choice(GENDERS),
+        'att': rng.randrange(101),
+        'achieve': rng.randrange(101),
+        'target': rng.randrange(101),
+        'seed': seed,
+    } for _ in range(count)]
+
+def cohort_calls(count=COHORT_SIZE, seed=0):
+    """generate_comment calls for a cohort scored in bands, as teachers enter them"""
+    rng = random.Random(seed)
+    subject_years = [(subject, year) for subject, years in SUBJECT_YEARS.items() for year in sorted(years)]
+    calls = []
+    for i in range(count):
+        subject, year = rng.choice(subject_years)
+        calls.append({
+            'subject': subject,
+            'year': year,
+            'name': f"Student{i}",
+            'gender': rng.choice(GENDERS),
+            'att': rng.choice(BANDS),
+            'achieve': rng.choice(BANDS),
+            'target': rng.choice(BANDS),
+            'seed': seed,
+        })
+    return calls
+
+def roster_csv(rows, seed=0):
+    """CSV bytes for a roster of rows students, with a few invalid rows"""
+    rng = random.Random(seed)
+    subject_years = [(subject, year) for subject, years in SUBJECT_YEARS.items() for year in sorted(years)]
+    lines = [ROSTER_COLUMNS]
+    for i in range(rows):
+        subject, year = rng.choice(subject_years)
+        name = f"  student {i}<b> " if i % 50 == 0 else f"Student {i}"
+        score = "n/a" if i % 97 == 0 else str(rng.randrange(101))
+        lines.append(f"{name},{rng.choice(GENDERS)},{subject},{year},{score},{rng.randrange(101)},{rng.randrange(101)}")
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+def export_entries(rows, seed=0):
+    """rows comment entries cycling through a pool of real generated comments"""
+    pool = []
+    for subject, years in SUBJECT_YEARS.items():
+        for year in sorted(years):
+            for call in engine_calls(subject, year, count=20, seed=seed):
+                pool.append((subject, year, generate_comment(**call, cache=None)))
+    timestamp = datetime(2026, 1, 1, 9, 0).strftime("%Y-%m-%d %H:%M")
+    return [{
+        'name': f"Student {i}",
+        'subject': pool[i % len(pool)][0],
+        'year': pool[i % len(pool)][1],
+        'comment': pool[i % len(pool)][2],
+        'timestamp': timestamp,
+    } for i in range(rows)]
+
+# BENCHMARKS
+def benchmarks(sizes):
+    """Yield (name, items, setup) where setup() returns the function to time"""
+    for subject, years in SUBJECT_YEARS.items():
+        for year in sorted(years):
+            def setup(subject=subject, year=year):
+                calls = engine_calls(subject, year)
+                return lambda: [generate_comment(**call, cache=None) for call in calls]
+            yield f"engine/{subject}/{year}", ENGINE_CALLS, setup
+
+    def cohort_setup(cached):
+        calls = cohort_calls()
+
+        def run():
+            cache = CommentCache() if cached else None
+            for call in calls:
+                generate_comment(**call, cache=cache)
+        return run
+    yield "engine/cohort/uncached", COHORT_SIZE, lambda: cohort_setup(False)
+    yield "engine/cohort/cached", COHORT_SIZE, lambda: cohort_setup(True)
+
+    for rows in sizes:
+        def setup(rows=rows):
+            data = roster_csv(rows)
+            return lambda: normalize_roster(read_roster(io.BytesIO(data))[0])
+        yield f"ingest/{rows}", rows, setup
+
+    for rows in sizes:
+        def setup(rows=rows):
+            entries = export_entries(rows)
+            return lambda: comments_to_docx(entries)
+        yield f"export/docx/{rows}", rows, setup
+
+        def setup(rows=rows):
+            entries = export_entries(rows)
+            return lambda: comments_to_csv(entries)
+        yield f"export/csv/{rows}", rows, setup
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(sizes, repeat, only=None):
+    """Run the benchmarks whose name contains any of only, returning the results document"""
+    load_all_templates()
+    results = {}
+    for name, items, setup in benchmarks(sizes):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        func = setup()
+        seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+        results[name] = {'seconds': seconds, 'items': items, 'per_item_us': seconds / items * 1e6}
+        print(f"{name:36} {seconds * 1e3:10.2f} ms  {seconds / items * 1e6:9.2f} us/item", flush=True)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+# COMPARE
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print each benchmark against the baseline; returns the names that regressed"""
+    regressions = []
+    old_results = baseline['results']
+    print(f"\nBaseline: {baseline.get('created')} (commit {baseline.get('commit')}, Python {baseline.get('python')})")
+    for name, result in current['results'].items():
+        old = old_results.get(name)
+        if old is None:
+            print(f"{name:36} {'new':>10}")
+            continue
+        ratio = result['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        else:
+            flag = ""
+        print(f"{name:36} {old['seconds'] * 1e3:10.2f} -> {result['seconds'] * 1e3:10.2f} ms  "
+              f"{ratio:6.2f}x  {flag}")
+    missing = sorted(set(old_results) - set(current['results']))
+    if missing:
+        print(f"Not run (in baseline): {', '.join(missing)}")
+    print(f"{len(regressions)} regression(s) over {threshold:.0%}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comment engine, ingestion and export benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="row counts for ingest/export")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per benchmark (best is reported)")
+    parser.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--save", metavar="PATH", help="write the results to PATH as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against the JSON baseline at PATH")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"slowdown flagged as a regression (default: {DEFAULT_THRESHOLD} = 20%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    current = run_suite(args.sizes, args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"Saved {len(current['results'])} results -> {args.save}")
+
+    if baseline is not None:
+        return 1 if compare(baseline, current, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
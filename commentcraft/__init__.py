@@ -0,0 +1,16 @@
+# COMMENTCRAFT CORE
+# Pure-Python comment engine behind the Streamlit apps and the batch tools.
+# Importing it has no UI side effects; exports live in commentcraft.exports.
+
+from .banks import COMMENT_REGISTRY, CommentTemplate, get_template
+from .engine import build_comment_parts, generate_comment, student_seed
+from .text import (
+    TARGET_CHARS,
+    finalize_comment,
+    get_pronouns,
+    lowercase_first,
+    rewrite_pronouns,
+    sanitize_column,
+    sanitize_input,
+    truncate_comment,
+)
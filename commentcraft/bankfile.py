@@ -0,0 +1,135 @@
+# BANK FILES
+# Statement banks as data: one JSON or TOML file per subject/year in
+# bank_data/ (or $COMMENTCRAFT_BANK_DIR). A file adds a new subject or year,
+# or replaces the statement module for one that already exists, without a
+# code change. Example (JSON):
+#
+#   {
+#     "subject": "Geography",
+#     "year": 7,
+#     "opening_phrases": ["This term,", "Over the past term,"],
+#     "attitude_bank": {"90": "showed real curiosity", "0": "needed support"},
+#     "banks": {
+#       "geography_bank": {"90": "applied map skills confidently", "0": "..."},
+#       "target_bank": {"90": "extend fieldwork analysis", "0": "..."}
+#     },
+#     "sentences": [
+#       {"skill": "geography_bank"},
+#       {"target": "target_bank"}
+#     ],
+#     "closer_bank": ["Progress was steady throughout the term."]
+#   }
+#
+# "year": null makes the file the subject's default for every year without
+# its own file; "default": true makes a year's file that default as well.
+# Sentences are {"skill": bank, "label": "reading"} for achievement
+# sentences and {"target": bank, "lead": "Additionally"} for targets.
+#
+# TOML files need Python 3.11 or later (tomllib); JSON works everywhere.
+#
+# manage_banks.py exports existing banks as files and checks new ones.
+
+import json
+import os
+
+BANK_DIR = os.environ.get(
+    "COMMENTCRAFT_BANK_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bank_data"),
+)
+BANK_FILE_EXTENSIONS = (".json", ".toml")
+
+class BankFileError(ValueError):
+    """A bank file that cannot be read or does not follow the format"""
+
+def _is_statement(text):
+    return isinstance(text, str) and bool(text.strip())
+
+def _bank(bank, path, name):
+    if not isinstance(bank, dict) or not bank:
+        raise BankFileError(f"{path}: {name} must be a non-empty mapping of band to statement")
+    for band, text in bank.items():
+        if not _is_statement(text):
+            raise BankFileError(f"{path}: {name} band {band} must be a non-empty string")
+    try:
+        return {int(band): text for band, text in bank.items()}
+    except ValueError:
+        raise BankFileError(f"{path}: {name} has a band that is not a whole number") from None
+
+def _phrases(spec, path, name):
+    phrases = spec.get(name)
+    if not isinstance(phrases, list) or not phrases or not all(_is_statement(p) for p in phrases):
+        raise BankFileError(f"{path}: {name} must be a non-empty list of non-empty strings")
+    return phrases
+
+def read_bank_file(path):
+    """Parse and validate a bank file into a template spec (see banks.build_template)"""
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise BankFileError(f"{path}: TOML bank files need Python 3.11 or later") from None
+    try:
+        if path.endswith(".toml"):
+            with open(path, 'rb') as f:
+                spec = tomllib.load(f)
+        else:
+            with open(path, encoding='utf-8') as f:
+                spec = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BankFileError(f"{path}: {e}") from None
+    if not isinstance(spec, dict):
+        raise BankFileError(f"{path}: expected an object at the top level")
+
+    subject = spec.get("subject")
+    if not isinstance(subject, str) or not subject.strip():
+        raise BankFileError(f"{path}: subject is required")
+    year = spec.get("year")
+    if year is not None and (not isinstance(year, int) or isinstance(year, bool)):
+        raise BankFileError(f"{path}: year must be a whole number or null")
+
+    raw_banks = spec.get("banks") or {}
+    if not isinstance(raw_banks, dict):
+        raise BankFileError(f"{path}: banks must map bank names to banks")
+    banks = {name: _bank(bank, path, name) for name, bank in raw_banks.items()}
+    sentences = []
+    for sentence in spec.get("sentences") or []:
+        bank_name = sentence.get("skill", sentence.get("target")) if isinstance(sentence, dict) else None
+        if bank_name is None:
+            raise BankFileError(f"{path}: each sentence needs a skill or target bank")
+        if bank_name not in banks:
+            raise BankFileError(f"{path}: sentence uses unknown bank {bank_name!r}")
+        if "skill" in sentence:
+            sentences.append({"skill": bank_name, "label": sentence.get("label")})
+        else:
+            sentences.append({"target": bank_name, "lead": sentence.get("lead", "For the next term")})
+
+    return {
+        "subject": subject.strip(),
+        "year": year,
+        "default": year is None or bool(spec.get("default")),
+        "opening_phrases": _phrases(spec, path, "opening_phrases"),
+        "attitude_bank": _bank(spec.get("attitude_bank"), path, "attitude_bank"),
+        "banks": banks,
+        "sentences": sentences,
+        "closer_bank": _phrases(spec, path, "closer_bank"),
+    }
+
+def bank_file_paths(directory=BANK_DIR):
+    """Bank files in directory, sorted by name (missing directory: none)"""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names if name.endswith(BANK_FILE_EXTENSIONS)]
+
+def spec_to_file_data(spec):
+    """JSON-ready bank file contents for a template spec"""
+    data = {"subject": spec["subject"], "year": spec["year"]}
+    if spec.get("default") and spec["year"] is not None:
+        data["default"] = True
+    data["opening_phrases"] = list(spec["opening_phrases"])
+    data["attitude_bank"] = {str(band): text for band, text in spec["attitude_bank"].items()}
+    data["banks"] = {name: {str(band): text for band, text in bank.items()} for name, bank in spec["banks"].items()}
+    data["sentences"] = [{k: v for k, v in sentence.items() if v is not None} for sentence in spec["sentences"]]
+    data["closer_bank"] = list(spec["closer_bank"])
+    return data
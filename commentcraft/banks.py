@@ -0,0 +1,333 @@
+# STATEMENT BANKS
+# Every (subject, year) pair maps to a CommentTemplate built from one
+# statement module or bank file (see bankfile.py), so generating a comment is
+# one registry lookup plus string assembly. Sources are loaded and compiled
+# the first time their subject/year is used, then kept for the life of the
+# process. New subjects or years only need a bank file.
+
+import importlib
+import importlib.util
+import random
+import threading
+
+from .bankfile import BANK_DIR, BankFileError, bank_file_paths, read_bank_file
+from .text import PRONOUN_SETS, lowercase_first, rewrite_pronouns
+
+# BAND LOOKUP
+# Banks are keyed by band thresholds (90, 85, ... 40, 0). Each bank is
+# expanded once into a 101-entry table so any score from 0 to 100, whole or
+# not, finds its band with one indexed read: the highest band at or below
+# the score, or the lowest band for scores beneath every key.
+SCORE_RANGE = 101
+
+def band_lookup(keys):
+    """Band key for every whole score 0-100"""
+    keys = sorted(keys)
+    lookup = []
+    band = keys[0]
+    for score in range(SCORE_RANGE):
+        for key in keys:
+            if key <= score:
+                band = key
+        lookup.append(band)
+    return tuple(lookup)
+
+def score_index(score):
+    """Table index for an int or float score, clamped to 0-100"""
+    return min(SCORE_RANGE - 1, max(0, int(score)))
+
+# PRONOUN VARIANTS
+# Every bank entry is resolved for each pronoun set once when the templates
+# are built, then laid out by score using the band lookup.
+def resolve_pronouns(bank, render=lambda text, pronoun: text):
+    """Map each pronoun set to a 101-entry tuple of resolved text by score"""
+    lookup = band_lookup(bank)
+    variants = {}
+    for pronoun, possessive in PRONOUN_SETS:
+        resolved = {
+            band: render(rewrite_pronouns(text, pronoun, possessive), pronoun)
+            for band, text in bank.items()
+        }
+        variants[(pronoun, possessive)] = tuple(resolved[band] for band in lookup)
+    return variants
+
+
+# SENTENCE PLAN
+class SkillSentence:
+    """Achievement sentence, e.g. "In reading, he understood texts..." """
+
+    score = "achieve"
+
+    def __init__(self, bank, label=None):
+        prefix = f"In {label}, " if label else ""
+
+        def render(text, pronoun):
+            if text[0].islower():
+                text = f"{pronoun} {text}"
+            return prefix + text
+
+        self.variants = resolve_pronouns(bank, render)
+
+    def render(self, pronouns, achieve, target):
+        return self.variants[pronouns][achieve]
+
+
+class TargetSentence:
+    """Target sentence, e.g. "For the next term, she should..." """
+
+    score = "target"
+
+    def __init__(self, bank, lead="For the next term"):
+        self.variants = resolve_pronouns(
+            bank, lambda text, pronoun: f"{lead}, {pronoun} should {lowercase_first(text)}"
+        )
+
+    def render(self, pronouns, achieve, target):
+        return self.variants[pronouns][target]
+
+
+class CommentTemplate:
+    """Compiled banks and sentence plan for one subject/year"""
+
+    def __init__(self, opening_phrases, attitude_bank, sentences, closer_bank):
+        self.opening_phrases = opening_phrases
+        self.attitude_variants = resolve_pronouns(attitude_bank)
+        self.sentences = tuple(sentences)
+        self.closer_bank = closer_bank
+
+    def choose(self, rng=random):
+        """Pick (opening, closer) indices; draws from rng exactly like two rng.choice calls"""
+        return rng.randrange(len(self.opening_phrases)), rng.randrange(len(self.closer_bank))
+
+    def render(self, name, pronouns, att, achieve, target, rng=random, choices=None):
+        """Return the comment sentences in order (opening first, closer last)"""
+        opening, closer = choices if choices is not None else self.choose(rng)
+        att, achieve, target = score_index(att), score_index(achieve), score_index(target)
+        parts = [f"{self.opening_phrases[opening]} {name} {self.attitude_variants[pronouns][att]}"]
+        for sentence in self.sentences:
+            parts.append(sentence.render(pronouns, achieve, target))
+        parts.append(self.closer_bank[closer])
+        return parts
+
+
+# TEMPLATE SPECS
+# A spec is the plain-data form of a template, as read from a bank file:
+# opening phrases, attitude bank, named banks, the sentence plan and the
+# closers. The statement modules use one of three fixed sentence plans.
+ENGLISH_SENTENCES = (
+    {"skill": "reading_bank", "label": "reading"},
+    {"skill": "writing_bank", "label": "writing"},
+    {"target": "reading_target_bank", "lead": "For the next term"},
+    {"target": "writing_target_bank", "lead": "Additionally"},
+)
+ESL_SENTENCES = (
+    {"skill": "reading_bank", "label": "reading"},
+    {"skill": "writing_bank", "label": "writing"},
+    {"skill": "speaking_bank", "label": "speaking"},
+    {"skill": "listening_bank", "label": "listening"},
+    {"target": "reading_target_bank", "lead": "For the next term"},
+    {"target": "writing_target_bank", "lead": "Additionally"},
+)
+
+def single_skill_sentences(skill_bank_name):
+    return (
+        {"skill": skill_bank_name, "label": None},
+        {"target": "target_bank", "lead": "For the next term"},
+    )
+
+def build_template(spec):
+    """Compile a template spec into a CommentTemplate"""
+    sentences = []
+    for sentence in spec["sentences"]:
+        if "skill" in sentence:
+            sentences.append(SkillSentence(spec["banks"][sentence["skill"]], sentence.get("label")))
+        else:
+            sentences.append(TargetSentence(spec["banks"][sentence["target"]], sentence["lead"]))
+    return CommentTemplate(spec["opening_phrases"], spec["attitude_bank"], sentences, spec["closer_bank"])
+
+
+# TEMPLATE SOURCES
+class ModuleSource:
+    """A statement module on sys.path plus its sentence plan"""
+
+    def __init__(self, module_name, sentences):
+        self.module_name = module_name
+        self.sentences = sentences
+
+    @property
+    def path(self):
+        spec = importlib.util.find_spec(self.module_name)
+        if spec is None or spec.origin is None:
+            raise ModuleNotFoundError(f"No module named '{self.module_name}'", name=self.module_name)
+        return spec.origin
+
+    def spec(self, reload=False):
+        module = importlib.import_module(self.module_name)
+        if reload:
+            module = importlib.reload(module)
+        bank_names = [sentence.get("skill", sentence.get("target")) for sentence in self.sentences]
+        return {
+            "opening_phrases": module.opening_phrases,
+            "attitude_bank": module.attitude_bank,
+            "banks": {name: getattr(module, name) for name in bank_names},
+            "sentences": [dict(sentence) for sentence in self.sentences],
+            "closer_bank": module.closer_bank,
+        }
+
+    def load(self, reload=False):
+        """Build the template; reload=True re-executes the module first"""
+        return build_template(self.spec(reload))
+
+
+class FileSource:
+    """A bank file (JSON or TOML)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def spec(self):
+        return read_bank_file(self.path)
+
+    def load(self, reload=False):
+        """Build the template (the file is read fresh every time)"""
+        return build_template(self.spec())
+
+
+# COMMENT REGISTRY
+# TEMPLATE_SOURCES says where each entry's banks come from. A year of None
+# is the subject's default and is used for any year without its own entry
+# (e.g. Years 10/11 for English); TEMPLATE_ALIASES points a key at an entry
+# that shares its banks. Bank files are registered after the modules, so a
+# file replaces the module for the same subject/year. COMMENT_REGISTRY
+# holds the templates built so far, shared by every session in the process.
+TEMPLATE_SOURCES = {
+    ("English", 5): ModuleSource("statements_year5_English", ENGLISH_SENTENCES),
+    ("English", 7): ModuleSource("statements_year7_English", ENGLISH_SENTENCES),
+    ("English", 8): ModuleSource("statements_year8_English", ENGLISH_SENTENCES),
+    ("Science", 5): ModuleSource("statements_year5_Science", single_skill_sentences("science_bank")),
+    ("Science", 7): ModuleSource("statements_year7_science", single_skill_sentences("science_bank")),
+    ("Science", 8): ModuleSource("statements_year8_science", single_skill_sentences("science_bank")),
+    ("Maths", 5): ModuleSource("statements_year5_Maths_NEW", single_skill_sentences("maths_bank")),
+    ("Maths", 7): ModuleSource("statements_year7_Maths_NEW", single_skill_sentences("maths_bank")),
+    ("Maths", 8): ModuleSource("statements_year8_Maths_NEW", single_skill_sentences("maths_bank")),
+    ("ESL (IGCSE)", None): ModuleSource("statements_igcse_0510_esl", ESL_SENTENCES),
+    ("Chemistry", None): ModuleSource("statements_igcse_0620_chemistry", single_skill_sentences("chemistry_bank")),
+}
+TEMPLATE_ALIASES = {
+    ("English", None): ("English", 8),
+    ("Science", None): ("Science", 8),
+    ("Maths", None): ("Maths", 8),
+}
+
+def register_bank_files(directory=BANK_DIR):
+    """Add a source for every valid bank file in directory; returns [(path, error)] for the rest"""
+    errors = []
+    for path in bank_file_paths(directory):
+        try:
+            # Schema only: compile errors show up in manage_banks.py check and on first use
+            spec = read_bank_file(path)
+        except BankFileError as e:
+            errors.append((path, str(e)))
+            continue
+        key = (spec["subject"], spec["year"])
+        TEMPLATE_SOURCES[key] = FileSource(path)
+        if spec["year"] is None:
+            TEMPLATE_ALIASES.pop(key, None)
+        elif spec["default"]:
+            TEMPLATE_ALIASES[(spec["subject"], None)] = key
+    return errors
+
+BANK_FILE_ERRORS = register_bank_files()
+
+COMMENT_REGISTRY = {}
+_registry_lock = threading.Lock()
+
+def template_key(subject, year):
+    """The TEMPLATE_SOURCES key that serves a subject/year, or None if the subject is unknown"""
+    for key in ((subject, year), (subject, None)):
+        key = TEMPLATE_ALIASES.get(key, key)
+        if key in TEMPLATE_SOURCES:
+            return key
+    return None
+
+def load_template(key):
+    """Load and compile the source for key (once per process)"""
+    with _registry_lock:
+        template = COMMENT_REGISTRY.get(key)
+        if template is None:
+            template = TEMPLATE_SOURCES[key].load()
+            COMMENT_REGISTRY[key] = template
+        return template
+
+def reload_template(key):
+    """Recompile one entry from its source and swap it in, returning (old, new).
+
+    The new template is built before the swap, so a failed build raises and
+    leaves the current template in place. Entries never loaded are left to
+    load on first use.
+    """
+    if key not in COMMENT_REGISTRY:
+        return None, None
+    template = TEMPLATE_SOURCES[key].load(reload=True)
+    with _registry_lock:
+        old = COMMENT_REGISTRY.get(key)
+        COMMENT_REGISTRY[key] = template
+    return old, template
+
+def install_templates(templates):
+    """Add prebuilt templates (e.g. from a snapshot) for keys not loaded yet"""
+    with _registry_lock:
+        for key, template in templates.items():
+            COMMENT_REGISTRY.setdefault(key, template)
+
+def check_template_sources():
+    """Raise ModuleNotFoundError for a missing statement module, without importing any"""
+    for source in TEMPLATE_SOURCES.values():
+        if isinstance(source, ModuleSource):
+            source.path
+
+def load_all_templates():
+    """Build every template up front, e.g. to warm a worker"""
+    return {key: load_template(key) for key in TEMPLATE_SOURCES}
+
+def get_template(subject, year):
+    """Look up the template for a subject/year, or None if the subject is unknown"""
+    key = template_key(subject, year)
+    if key is None:
+        return None
+    template = COMMENT_REGISTRY.get(key)
+    if template is None:
+        template = load_template(key)
+    return template
+
+
+# SUPPORTED VALUES
+# What the app offers and the batch upload accepts. The IGCSE courses are
+# Year 10/11 only; the other subjects reuse the Year 8 banks for 10/11.
+# Subjects from bank files offer the years they have files for, or every
+# year once they have a default file.
+BANDS = (90, 85, 80, 75, 70, 65, 60, 55, 40)
+STANDARD_YEARS = (5, 7, 8, 10, 11)
+STANDARD_SUBJECT_YEARS = {
+    "English": STANDARD_YEARS,
+    "Maths": STANDARD_YEARS,
+    "Science": STANDARD_YEARS,
+    "ESL (IGCSE)": (10, 11),
+    "Chemistry": (10, 11),
+}
+
+def supported_subject_years():
+    """Years offered for each subject, including subjects and years from bank files"""
+    subject_years = {subject: set(years) for subject, years in STANDARD_SUBJECT_YEARS.items()}
+    for subject, year in TEMPLATE_SOURCES:
+        years = subject_years.setdefault(subject, set())
+        if year is not None:
+            years.add(year)
+    for subject, years in subject_years.items():
+        if subject not in STANDARD_SUBJECT_YEARS and template_key(subject, None) is not None:
+            years.update(STANDARD_YEARS)
+    return {subject: tuple(sorted(years)) for subject, years in subject_years.items()}
+
+SUBJECT_YEARS = supported_subject_years()
+SUBJECTS = tuple(SUBJECT_YEARS)
+YEARS = tuple(sorted({year for years in SUBJECT_YEARS.values() for year in years}))
@@ -0,0 +1,91 @@
+# BATCH GENERATION
+# Generates comments for whole rosters. Rows are split into chunks that run
+# on a ProcessPoolExecutor, and every row gets its own random.Random seeded
+# from the student and the run's seed, so the output does not depend on the
+# number of workers or on the order of the rows. With a bank snapshot, every
+# worker memory-maps the same file instead of loading its own banks.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import generate_comment
+from .snapshot import load_snapshot
+
+CHUNK_SIZE = 500
+
+def generate_row(row, timestamp, seed=0):
+    """Generate the comment entry for one normalized roster row (see normalize_roster)"""
+    name = row['Student Name']
+    subject = row['Subject']
+    year = row['Year']
+    comment = generate_comment(
+        subject=subject,
+        year=year,
+        name=name,
+        gender=row['Gender'],
+        att=row['Attitude'],
+        achieve=row['Achievement'],
+        target=row['Target'],
+        name_sanitized=True,
+        seed=seed
+    )
+    return {
+        'name': name,
+        'subject': subject,
+        'year': year,
+        'comment': comment,
+        'timestamp': timestamp
+    }
+
+def generate_chunk(start, rows, timestamp, seed=0):
+    """Generate one chunk, returning (entries, errors) with 1-based row numbers"""
+    entries = []
+    errors = []
+    for offset, row in enumerate(rows):
+        try:
+            entries.append(generate_row(row, timestamp, seed))
+        except Exception as e:
+            errors.append(f"Error processing row {row.get('Row', start + offset + 1)}: {e}")
+    return entries, errors
+
+def generate_batch(rows, timestamp, workers=None, chunk_size=CHUNK_SIZE, seed=0, snapshot=None, progress=None):
+    """Generate entries for a list of normalized row dicts, returning (entries, errors).
+
+    Entries and errors come back in row order. workers=1 runs in-process;
+    the default uses one worker per CPU. snapshot is an optional bank
+    snapshot path for every process to map (see snapshot.py). progress is
+    called with the number of rows done after each chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [(start, rows[start:start + chunk_size]) for start in range(0, len(rows), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        if snapshot:
+            load_snapshot(snapshot)
+        results = (generate_chunk(start, chunk, timestamp, seed) for start, chunk in chunks)
+        return collect_chunks(results, chunks, progress)
+
+    initializer, initargs = (load_snapshot, (snapshot,)) if snapshot else (None, ())
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=initializer,
+                             initargs=initargs) as pool:
+        results = pool.map(
+            generate_chunk,
+            [start for start, _ in chunks],
+            [chunk for _, chunk in chunks],
+            [timestamp] * len(chunks),
+            [seed] * len(chunks),
+        )
+        return collect_chunks(results, chunks, progress)
+
+def collect_chunks(results, chunks, progress=None):
+    """Join chunk results in order, reporting rows done as each chunk arrives"""
+    entries = []
+    errors = []
+    done = 0
+    for (_, chunk), (chunk_entries, chunk_errors) in zip(chunks, results):
+        entries.extend(chunk_entries)
+        errors.extend(chunk_errors)
+        done += len(chunk)
+        if progress is not None:
+            progress(done)
+    return entries, errors
@@ -0,0 +1,114 @@
+# COMMENT ENGINE
+# Side-effect-free comment generation: no Streamlit, no session state.
+# Openings and closers come from the rng argument, which defaults to the
+# global random module. Pass seed instead to derive a private random.Random
+# from the student and the seed, so the same request always gives the same
+# comment, in any session or process. The finalized achievement and target
+# sentences and closers are memoized in COMMENT_CACHE (see cache.py), so
+# only the sentence with the student's name is finalized per call.
+
+import hashlib
+import random
+
+from .banks import get_template
+from .cache import COMMENT_CACHE
+from .text import (
+    TARGET_CHARS,
+    finalize_comment,
+    finalize_sentence,
+    get_pronouns,
+    lowercase_first,
+    rewrite_pronouns,
+    sanitize_input,
+    truncate_comment,
+)
+
+def student_seed(name, subject, year, seed=0):
+    """Stable seed for one student's comment, the same in every process (name already sanitized).
+
+    Changing seed gives a different, equally reproducible set of comments.
+    """
+    key = f"{name}|{subject}|{year}|{seed}".encode('utf-8')
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], 'big')
+
+def build_comment_parts(subject, year, name, gender, att, achieve, target, rng=random):
+    """Build the comment sentences for one student (name must already be sanitized)"""
+    template = get_template(subject, year)
+    if template is None:
+        # Default fallback if subject not recognized
+        return [f"{name} has worked in {subject} this term."]
+    return template.render(name, get_pronouns(gender), att, achieve, target, rng)
+
+# COMMENT GENERATION
+# Every comment part ends with a period, so each one is finalized on its own
+# (see finalize_sentence). The achievement/target sentences and the closer
+# do not contain the name, so their finalized text is cached, keyed by the
+# template and the rendered text; every student in the same score bands and
+# pronoun set shares one entry. Only the opening sentence, which holds the
+# name, is finalized per call.
+def optional_sentence(optional_text, pronouns):
+    """The "Additionally, ..." sentence for the teacher's optional text, or None"""
+    optional_text = sanitize_input(optional_text) if optional_text else ""
+    if not optional_text:
+        return None
+    optional_text = rewrite_pronouns(optional_text, *pronouns)
+    sentence = f"Additionally, {lowercase_first(optional_text)}"
+    if not sentence.endswith('.'):
+        sentence += '.'
+    return sentence
+
+def add_optional_sentence(comment_parts, sentence):
+    if sentence:
+        # Insert before the closer sentence (second to last position)
+        if comment_parts:
+            comment_parts.insert(-1, sentence)
+        else:
+            comment_parts.append(sentence)
+    return comment_parts
+
+def generate_comment(subject, year, name, gender, att, achieve, target, optional_text=None, rng=random,
+                     name_sanitized=False, seed=None, cache=COMMENT_CACHE):
+    """Generate a report comment based on subject, year, and performance bands.
+
+    Pass name_sanitized=True when the name has already been through
+    sanitize_input or sanitize_column, so it is not cleaned a second time.
+    With seed set, rng is replaced by one seeded from student_seed.
+    cache=None skips the shared comment cache.
+    """
+    if not name_sanitized:
+        name = sanitize_input(name)
+    if seed is not None:
+        rng = random.Random(student_seed(name, subject, year, seed))
+    pronouns = get_pronouns(gender)
+    extra = optional_sentence(optional_text, pronouns)
+
+    # Look up the compiled template for this subject/year
+    template = get_template(subject, year)
+    if template is None:
+        # Default fallback if subject not recognized
+        comment_parts = [f"{name} has worked in {subject} this term."]
+        return finalize_comment(add_optional_sentence(comment_parts, extra), TARGET_CHARS)
+
+    comment_parts = template.render(name, pronouns, att, achieve, target, rng)
+    if cache is None:
+        # Periods, capitalization and truncation in a single pass
+        return finalize_comment(add_optional_sentence(comment_parts, extra), TARGET_CHARS)
+
+    middle_key = (template, tuple(comment_parts[1:-1]))
+    middle = cache.get(middle_key)
+    if middle is None:
+        middle = ' '.join(finalize_sentence(part) for part in comment_parts[1:-1])
+        cache.put(middle_key, middle)
+    closer_key = (template, comment_parts[-1])
+    closer = cache.get(closer_key)
+    if closer is None:
+        closer = finalize_sentence(comment_parts[-1])
+        cache.put(closer_key, closer)
+
+    sentences = [finalize_sentence(comment_parts[0])]
+    if middle:
+        sentences.append(middle)
+    if extra:
+        sentences.append(finalize_sentence(extra))
+    sentences.append(closer)
+    return truncate_comment(' '.join(sentences), TARGET_CHARS)
@@ -0,0 +1,252 @@
+# REPORT EXPORTS
+# Word and CSV builders shared by the Streamlit app and the command-line
+# batch generator. Each entry is a dict with name, subject, year, comment
+# and timestamp keys; a CommentStore (the app's st.session_state.all_comments)
+# works anywhere a list of entries does.
+# python-docx and pandas are imported on first use so the engine stays
+# quick to import.
+
+import io
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+CSV_MIME = "text/csv"
+ZIP_MIME = "application/zip"
+
+def export_timestamp():
+    return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+def export_filename(extension):
+    return f"report_comments_{datetime.now().strftime('%Y%m%d_%H%M')}.{extension}"
+
+# STREAMING DOCX
+# The Word export does not build a python-docx object tree. The package
+# parts of an empty python-docx document are captured once per process,
+# and word/document.xml is streamed into the zip one student at a time as
+# the same WordprocessingML python-docx writes for this layout: a Title,
+# two info lines, then a Heading 2 and a paragraph per student, each
+# followed by an empty paragraph.
+DOCX_DOCUMENT_PART = "word/document.xml"
+
+@lru_cache(maxsize=1)
+def docx_package():
+    """(parts, head, tail): an empty document's zip parts and document.xml around the body content"""
+    from docx import Document
+
+    bio = io.BytesIO()
+    Document().save(bio)
+    with zipfile.ZipFile(bio) as package:
+        parts = [(info, package.read(info)) for info in package.infolist()]
+    document = next(data for info, data in parts if info.filename == DOCX_DOCUMENT_PART)
+    body = document.index(b"<w:body>") + len(b"<w:body>")
+    return parts, document[:body], document[body:]
+
+def docx_text(text):
+    """w:t/w:tab/w:br run content for text, split the way python-docx splits it"""
+    xml = []
+    chunk = []
+
+    def flush():
+        if chunk:
+            value = ''.join(chunk)
+            space = ' xml:space="preserve"' if len(value.strip()) < len(value) else ''
+            xml.append(f'<w:t{space}>{escape(value)}</w:t>')
+            chunk.clear()
+
+    for char in text:
+        if char == '\t':
+            flush()
+            xml.append('<w:tab/>')
+        elif char in '\r\n':
+            flush()
+            xml.append('<w:br/>')
+        else:
+            chunk.append(char)
+    flush()
+    return ''.join(xml)
+
+def docx_paragraph(text='', style=None):
+    """One w:p element, like Document.add_paragraph(text, style)"""
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    if not text:
+        return f'<w:p>{properties}</w:p>' if properties else '<w:p/>'
+    return f'<w:p>{properties}<w:r>{docx_text(text)}</w:r></w:p>'
+
+def docx_body(entries):
+    """Yield the document body as UTF-8 chunks: the header, then one chunk per entry"""
+    yield (
+        docx_paragraph('Report Comments', 'Title')
+        + docx_paragraph(f'Generated: {export_timestamp()}')
+        + docx_paragraph(f'Total Students: {len(entries)}')
+        + docx_paragraph('')
+    ).encode('utf-8')
+    for entry in entries:
+        yield (
+            docx_paragraph(f"{entry['name']} - {entry['subject']} Year {entry['year']}", 'Heading2')
+            + docx_paragraph(entry['comment'])
+            + docx_paragraph('')
+        ).encode('utf-8')
+
+def write_docx(entries, out):
+    """Stream the Word export into out, a writable binary file"""
+    parts, head, tail = docx_package()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as package:
+        for info, data in parts:
+            if info.filename != DOCX_DOCUMENT_PART:
+                package.writestr(info, data)
+                continue
+            with package.open(info, 'w') as document:
+                document.write(head)
+                for chunk in docx_body(entries):
+                    document.write(chunk)
+                document.write(tail)
+
+def comments_to_docx(entries):
+    """Build one Word document with a heading and paragraph per student"""
+    bio = io.BytesIO()
+    write_docx(entries, bio)
+    return bio.getvalue()
+
+# PER-STUDENT PACK
+# One .docx per student, stored in a ZIP under Subject/Year N/ folders.
+# Every student file shares the same static parts, so they are compressed
+# once into a stub package and each student's document.xml is appended to
+# a copy of it. Files are rendered on a thread pool with a bounded number
+# in flight and written to the ZIP in entry order as they finish, so memory
+# does not grow with the class size.
+PACK_IN_FLIGHT_PER_WORKER = 4
+UNSAFE_PATH_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+@lru_cache(maxsize=1)
+def docx_stub():
+    """An empty document's package without word/document.xml, as zip bytes"""
+    parts, head, tail = docx_package()
+    bio = io.BytesIO()
+    with zipfile.ZipFile(bio, 'w', zipfile.ZIP_DEFLATED) as package:
+        for info, data in parts:
+            if info.filename != DOCX_DOCUMENT_PART:
+                package.writestr(info, data)
+    return bio.getvalue()
+
+def student_docx(entry, timestamp=None):
+    """Word document for one entry: name, subject/year, date and the comment"""
+    parts, head, tail = docx_package()
+    info = next(info for info, data in parts if info.filename == DOCX_DOCUMENT_PART)
+    body = (
+        docx_paragraph(entry['name'], 'Title')
+        + docx_paragraph(f"{entry['subject']} Year {entry['year']}", 'Heading2')
+        + docx_paragraph(f'Generated: {timestamp or export_timestamp()}')
+        + docx_paragraph('')
+        + docx_paragraph(entry['comment'])
+    ).encode('utf-8')
+    bio = io.BytesIO(docx_stub())
+    bio.seek(0, io.SEEK_END)
+    with zipfile.ZipFile(bio, 'a') as package:
+        package.writestr(info, head + body + tail)
+    return bio.getvalue()
+
+def safe_path_part(text):
+    """text with characters that are unsafe in file names replaced"""
+    return UNSAFE_PATH_CHARS.sub('_', str(text)).strip(' .') or '_'
+
+def pack_paths(entries):
+    """Yield the ZIP path for each entry, numbering repeated names within a folder"""
+    seen = {}
+    for entry in entries:
+        folder = f"{safe_path_part(entry['subject'])}/Year {safe_path_part(entry['year'])}"
+        name = safe_path_part(entry['name'])
+        key = (folder, name.casefold())
+        seen[key] = seen.get(key, 0) + 1
+        suffix = f" ({seen[key]})" if seen[key] > 1 else ''
+        yield f"{folder}/{name}{suffix}.docx"
+
+def write_docx_pack(entries, out, workers=None):
+    """Stream a ZIP of one .docx per entry into out, a writable binary file"""
+    workers = workers or os.cpu_count() or 1
+    timestamp = export_timestamp()
+    in_flight = workers * PACK_IN_FLIGHT_PER_WORKER
+    docx_stub()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_STORED) as pack, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for path, entry in zip(pack_paths(entries), entries):
+            pending.append((path, pool.submit(student_docx, entry, timestamp)))
+            if len(pending) >= in_flight:
+                path, future = pending.pop(0)
+                pack.writestr(path, future.result())
+        for path, future in pending:
+            pack.writestr(path, future.result())
+
+def comments_to_docx_pack(entries, workers=None):
+    """Build the per-student ZIP pack as a rewound BytesIO (no copy of the pack)"""
+    bio = io.BytesIO()
+    write_docx_pack(entries, bio, workers)
+    bio.seek(0)
+    return bio
+
+def comments_to_csv(entries):
+    """Build the CSV export (UTF-8 bytes) for a list of comment entries"""
+    import pandas as pd
+
+    csv_data = []
+    for entry in entries:
+        csv_data.append({
+            'Student Name': entry['name'],
+            'Subject': entry['subject'],
+            'Year': entry['year'],
+            'Comment': entry['comment'],
+            'Generated': entry['timestamp']
+        })
+
+    df_export = pd.DataFrame(csv_data)
+    return df_export.to_csv(index=False).encode('utf-8')
+
+# EXPORT MEMO
+# Export files for one session's comment list, kept until the list changes.
+# Files are keyed by the CommentStore's version, so repeated downloads and
+# reruns reuse the bytes instead of rebuilding them. The per-student pack is
+# built on every download and never kept: it is tens of kilobytes per
+# student, which would hold megabytes per session.
+EXPORT_BUILDERS = {
+    'docx': comments_to_docx,
+    'csv': comments_to_csv,
+    'zip': comments_to_docx_pack,
+}
+CACHED_EXPORTS = ('docx', 'csv')
+
+class ExportCache:
+    """Export bytes for the latest version of a comment list"""
+
+    def __init__(self):
+        self.version = None
+        self.builds = 0
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind, entries, version):
+        """The kind export of entries (bytes, or a BytesIO for the pack), built at most once per version for CACHED_EXPORTS"""
+        if kind not in CACHED_EXPORTS:
+            return EXPORT_BUILDERS[kind](entries)
+        with self._lock:
+            if self.version is not None and version < self.version:
+                # A download button from before the latest change
+                return EXPORT_BUILDERS[kind](entries)
+            if version != self.version:
+                self._files.clear()
+                self.version = version
+            data = self._files.get(kind)
+            if data is None:
+                data = self._files[kind] = EXPORT_BUILDERS[kind](entries)
+                self.builds += 1
+            return data
+
+    def builder(self, kind, entries, version):
+        """Zero-argument callable for st.download_button, building when it is clicked"""
+        return lambda: self.get(kind, entries, version)
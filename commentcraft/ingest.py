@@ -0,0 +1,160 @@
+# ROSTER INGESTION
+# Parses roster CSVs straight from a path or an in-memory buffer (such as a
+# Streamlit upload) without copying it or writing it to disk. Rows are read
+# incrementally in chunks, so a row limit stops parsing early.
+
+import numpy as np
+import pandas as pd
+
+from .banks import SUBJECTS, SUBJECT_YEARS
+from .text import sanitize_column
+
+CHUNK_ROWS = 1000
+
+def iter_roster_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Yield the roster as DataFrame chunks of up to chunk_rows rows"""
+    if hasattr(source, 'seek'):
+        # Uploaded files survive Streamlit reruns, so always start at the top
+        source.seek(0)
+    with pd.read_csv(source, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk
+
+def read_roster(source, max_rows=None, chunk_rows=CHUNK_ROWS):
+    """Read a roster CSV, returning (df, truncated).
+
+    With max_rows set, parsing stops once more than max_rows rows have been
+    seen and only the first max_rows are returned.
+    """
+    if max_rows is not None:
+        chunk_rows = min(chunk_rows, max_rows + 1)
+    chunks = []
+    row_count = 0
+    truncated = False
+    for chunk in iter_roster_chunks(source, chunk_rows):
+        chunks.append(chunk)
+        row_count += len(chunk)
+        if max_rows is not None and row_count > max_rows:
+            truncated = True
+            break
+
+    if not chunks:
+        # Header-only file: read it again for the (empty) columns
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_csv(source), False
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    if truncated:
+        df = df.head(max_rows)
+    return df, truncated
+
+# ROSTER NORMALIZATION
+# Runs column-wise over the whole upload before generation: coerces the
+# numeric columns, maps common spellings to canonical values and splits off
+# rows that cannot be generated, so the batch loop gets clean, typed rows.
+
+SUBJECT_ALIASES = {
+    # Every subject by its own name, including ones added by bank files
+    **{subject.lower(): subject for subject in SUBJECTS},
+    "english": "English",
+    "maths": "Maths",
+    "math": "Maths",
+    "mathematics": "Maths",
+    "science": "Science",
+    "esl (igcse)": "ESL (IGCSE)",
+    "esl": "ESL (IGCSE)",
+    "igcse esl": "ESL (IGCSE)",
+    "esl 0510": "ESL (IGCSE)",
+    "0510": "ESL (IGCSE)",
+    "chemistry": "Chemistry",
+    "igcse chemistry": "Chemistry",
+    "chemistry 0620": "Chemistry",
+    "0620": "Chemistry",
+}
+
+GENDER_ALIASES = {
+    "male": "Male",
+    "m": "Male",
+    "boy": "Male",
+    "female": "Female",
+    "f": "Female",
+    "girl": "Female",
+}
+
+BAND_COLUMNS = ("Attitude", "Achievement", "Target")
+ROSTER_COLUMNS = ("Row", "Student Name", "Gender", "Subject", "Year") + BAND_COLUMNS
+# Added to rejected rows; named so it cannot clash with an uploaded Row column
+UPLOAD_ROW_COLUMN = "Upload Row"
+
+def _column(df, name, default):
+    """A column of the roster, or the batch default when it is absent"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+def _whole_numbers(series):
+    """Coerce to numbers, returning (values, mask of valid whole numbers)"""
+    values = pd.to_numeric(series, errors='coerce')
+    return values, values.notna() & (values % 1 == 0)
+
+def normalize_roster(df):
+    """Validate and canonicalize a roster, returning (clean, rejected).
+
+    clean has ROSTER_COLUMNS with a sanitized Student Name, int Year/scores
+    and canonical Subject and Gender. rejected holds the original columns of the failing rows plus
+    Upload Row (1-based position in the upload) and Reason.
+    """
+    df = df.reset_index(drop=True)
+    rows = pd.Series(range(1, len(df) + 1), index=df.index)
+    problems = []
+
+    def reject(mask, reason):
+        problems.append((mask.to_numpy(dtype=bool), reason))
+
+    # Sanitized once here; generation reuses the cleaned names as-is
+    names = sanitize_column(_column(df, 'Student Name', ''))
+    reject(names == '', "missing Student Name")
+
+    genders = _column(df, 'Gender', '').fillna('').astype(str).str.strip()
+    genders = genders.str.lower().map(GENDER_ALIASES).fillna(genders)
+
+    raw_subjects = _column(df, 'Subject', 'English').fillna('').astype(str).str.strip()
+    subjects = raw_subjects.str.lower().map(SUBJECT_ALIASES)
+    reject(subjects.isna(), "unknown Subject")
+
+    years, valid_year = _whole_numbers(_column(df, 'Year', 7))
+    reject(~valid_year, "Year is not a whole number")
+    valid_pairs = pd.MultiIndex.from_tuples(
+        [(subject, year) for subject, subject_years in SUBJECT_YEARS.items() for year in subject_years]
+    )
+    pairs = pd.MultiIndex.from_arrays([subjects.fillna(''), years.where(valid_year, -1).astype(int)])
+    reject(subjects.notna() & valid_year & ~pairs.isin(valid_pairs), "Year not offered for Subject")
+
+    bands = {}
+    for column in BAND_COLUMNS:
+        # Any 0-100 score works: the banks map it to its band on lookup
+        values = pd.to_numeric(_column(df, column, 75), errors='coerce')
+        in_range = values.between(0, 100)
+        reject(~in_range, f"{column} is not a score from 0 to 100")
+        bands[column] = np.floor(values.where(in_range, 0))
+
+    bad = np.zeros(len(df), dtype=bool)
+    for mask, _ in problems:
+        bad |= mask
+    ok = ~bad
+    clean = pd.DataFrame({
+        'Row': rows[ok],
+        'Student Name': names[ok],
+        'Gender': genders[ok],
+        'Subject': subjects[ok],
+        'Year': years[ok].astype(int),
+        **{column: values[ok].astype(int) for column, values in bands.items()},
+    }, columns=list(ROSTER_COLUMNS)).reset_index(drop=True)
+
+    rejected = df[~ok].copy()
+    rejected.insert(0, UPLOAD_ROW_COLUMN, rows[~ok])
+    rejected['Reason'] = [
+        '; '.join(reason for mask, reason in problems if mask[i]) for i in np.flatnonzero(bad)
+    ]
+    return clean, rejected.reset_index(drop=True)
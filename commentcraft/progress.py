@@ -0,0 +1,83 @@
+# PROGRESS METER
+# Throughput, ETA and throttled progress reports for batch runs. Updating a
+# progress display for every row costs more than generating the row, so
+# update() only reports when at least min_interval seconds and min_rows rows
+# have passed since the last report (the final row always reports). Rates
+# come from the measured throughput since the run started.
+
+import threading
+import time
+
+PROGRESS_INTERVAL_SECONDS = 0.5
+PROGRESS_MIN_FRACTION = 0.01
+
+def format_duration(seconds):
+    """Seconds as M:SS, or H:MM:SS from an hour up"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class ProgressMeter:
+    """Tracks rows done out of total and decides when progress is worth reporting"""
+
+    def __init__(self, total, min_interval=PROGRESS_INTERVAL_SECONDS, min_rows=None, clock=time.perf_counter):
+        self.total = total
+        self.min_interval = min_interval
+        self.min_rows = min_rows if min_rows is not None else max(1, int(total * PROGRESS_MIN_FRACTION))
+        self.done = 0
+        self.reports = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.finished = None
+        self._reported_at = self.started
+        self._reported_done = 0
+
+    def update(self, done):
+        """Record rows done so far; returns True when a progress report is due"""
+        with self._lock:
+            now = self._clock()
+            self.done = done
+            if done >= self.total:
+                self.finished = self.finished or now
+            elif now - self._reported_at < self.min_interval or done - self._reported_done < self.min_rows:
+                return False
+            if done == self._reported_done and self.reports:
+                return False
+            self._reported_at = now
+            self._reported_done = done
+            self.reports += 1
+            return True
+
+    def stop(self):
+        """Stop the clock early (e.g. on cancel)"""
+        with self._lock:
+            self.finished = self.finished or self._clock()
+
+    @property
+    def elapsed(self):
+        return (self.finished or self._clock()) - self.started
+
+    @property
+    def fraction(self):
+        return min(self.done / self.total, 1.0) if self.total else 1.0
+
+    @property
+    def rate(self):
+        """Rows per second so far"""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Estimated seconds left, or None before any throughput is measured"""
+        rate = self.rate
+        return (self.total - self.done) / rate if rate else None
+
+    def status(self):
+        eta = self.eta
+        return (f"{self.done:,} of {self.total:,} rows, {self.rate:,.0f} rows/s, "
+                f"ETA {format_duration(eta) if eta is not None else '--'}")
+
+    def summary(self):
+        return f"{self.done:,} rows in {self.elapsed:.2f} s ({self.rate:,.0f} rows/s)"
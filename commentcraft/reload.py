@@ -0,0 +1,118 @@
+# BANK HOT RELOAD
+# Picks up edits to statement modules and bank files without restarting the
+# server. A watcher polls the source of every registry entry: a changed
+# mtime or size triggers a content hash, and only a changed hash recompiles
+# that one (subject, year) entry, swaps it into the registry and drops the
+# cached comments built from the old template. Everything else, including
+# every open session, carries on untouched.
+#
+# New bank files and new subjects are picked up on the next restart. Sources
+# that cannot be found at startup (e.g. a missing statement module) are not
+# watched and stay listed in last_errors.
+
+import os
+import threading
+
+from .banks import TEMPLATE_SOURCES, reload_template
+from .cache import COMMENT_CACHE
+from .snapshot import file_hash
+
+RELOAD_INTERVAL_SECONDS = 2.0
+HOT_RELOAD_ENV = "COMMENTCRAFT_HOT_RELOAD"
+
+class BankWatcher:
+    """Tracks the bank sources and reloads the entries whose contents change"""
+
+    def __init__(self, cache=COMMENT_CACHE):
+        self.cache = cache
+        self.unwatched = []
+        self._signatures = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._paths = {}
+        for key, source in TEMPLATE_SOURCES.items():
+            try:
+                path = source.path
+                if path not in self._signatures:
+                    self._signatures[path] = self._signature(path)
+            except (ImportError, OSError) as e:
+                # Not watched; the entry fails with the same error on first use
+                self.unwatched.append((key, str(e)))
+                continue
+            self._paths[key] = path
+        self.last_errors = list(self.unwatched)
+
+    @staticmethod
+    def _signature(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size, file_hash(path)
+
+    def _changed(self, path):
+        """Whether the file's contents differ from the last check"""
+        stat = os.stat(path)
+        mtime, size, digest = self._signatures[path]
+        if (stat.st_mtime_ns, stat.st_size) == (mtime, size):
+            return False
+        new_digest = file_hash(path)
+        self._signatures[path] = (stat.st_mtime_ns, stat.st_size, new_digest)
+        return new_digest != digest
+
+    def check(self):
+        """Reload changed entries; returns (reloaded keys, [(key or path, error)])"""
+        reloaded = []
+        errors = []
+        with self._lock:
+            changed = set()
+            for path in self._signatures:
+                try:
+                    if self._changed(path):
+                        changed.add(path)
+                except OSError as e:
+                    errors.append((path, str(e)))
+            for key, path in self._paths.items():
+                if path not in changed:
+                    continue
+                try:
+                    old, new = reload_template(key)
+                except Exception as e:
+                    # Keep serving the last good template until the file is fixed
+                    errors.append((key, str(e)))
+                    continue
+                if new is None:
+                    # Not loaded yet: the first use reads the edited source
+                    continue
+                self.cache.invalidate(lambda cache_key: cache_key[0] is old)
+                reloaded.append(key)
+            if reloaded or errors:
+                self.last_errors = self.unwatched + errors
+        return reloaded, errors
+
+    def start(self, interval=RELOAD_INTERVAL_SECONDS):
+        """Poll in a daemon thread every interval seconds"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="bank-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.check()
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def hot_reload_enabled():
+    """Hot reload is on unless COMMENTCRAFT_HOT_RELOAD is "0" """
+    return os.environ.get(HOT_RELOAD_ENV, "1") != "0"
+
+def start_bank_watcher(interval=RELOAD_INTERVAL_SECONDS):
+    """Start the process-wide watcher once (no-op afterwards), returning it"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = BankWatcher()
+            _watcher.start(interval)
+        return _watcher
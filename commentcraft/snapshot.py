@@ -0,0 +1,231 @@
+# BANK SNAPSHOT
+# Opt-in fast start and shared worker memory. Every template is compiled
+# into one compact binary file: each distinct statement is stored once as
+# UTF-8, and each template is an array of string ids laid out by pronoun
+# set and score. Processes memory-map the file and read statements straight
+# from it, so no statement module is imported or compiled and all workers
+# on a host share the same pages instead of holding their own copies.
+#
+# Each entry records the sha256 of the module or bank file it was compiled
+# from, and the file records a hash of the compiling code. Entries whose
+# source has changed are skipped (their subject/year loads from source as
+# usual), so a stale snapshot is never served.
+#
+# Build:  python manage_banks.py compile [-o PATH]
+# Use:    COMMENTCRAFT_FAST_START=1 streamlit run app_fixed.py
+#         python batch_generate.py roster.csv -o out.csv --snapshot PATH
+#
+# Layout: MAGIC, u32 header length, JSON header, then (4-byte aligned)
+# u32 template records, u32 string offsets and the UTF-8 string data.
+
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+from array import array
+
+from . import bankfile, banks, text
+from .banks import SCORE_RANGE, TEMPLATE_SOURCES, install_templates, score_index
+from .text import PRONOUN_SETS
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_MAGIC = b"CCBANKS\n"
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "banks.snapshot")
+
+PRONOUN_INDEX = {pronouns: index for index, pronouns in enumerate(PRONOUN_SETS)}
+SCORE_FIELDS = ("achieve", "target")
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def code_hash():
+    """Hash of the code that turns sources into templates"""
+    digest = hashlib.sha256()
+    for module in (bankfile, banks, text):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+# COMPILER
+def compile_template(template, string_id):
+    """u32 record for one template: counts, then string ids by pronoun set and score"""
+    record = [len(template.opening_phrases)]
+    record.extend(string_id(phrase) for phrase in template.opening_phrases)
+    record.append(len(template.closer_bank))
+    record.extend(string_id(phrase) for phrase in template.closer_bank)
+    record.append(len(template.sentences))
+    for pronouns in PRONOUN_SETS:
+        record.extend(string_id(part) for part in template.attitude_variants[pronouns])
+    for sentence in template.sentences:
+        record.append(SCORE_FIELDS.index(sentence.score))
+        for pronouns in PRONOUN_SETS:
+            record.extend(string_id(part) for part in sentence.variants[pronouns])
+    return record
+
+def build_snapshot(path=SNAPSHOT_PATH):
+    """Compile every template source into a snapshot file, returning the template count"""
+    strings = {}
+
+    def string_id(value):
+        return strings.setdefault(value, len(strings))
+
+    records = array('I')
+    entries = []
+    for (subject, year), source in TEMPLATE_SOURCES.items():
+        entries.append({
+            'subject': subject,
+            'year': year,
+            'source': file_hash(source.path),
+            'offset': len(records),
+        })
+        records.extend(compile_template(source.load(), string_id))
+
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = array('I', [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    if sys.byteorder != 'little':
+        records.byteswap()
+        offsets.byteswap()
+
+    header = json.dumps({
+        'version': SNAPSHOT_VERSION,
+        'code': code_hash(),
+        'entries': entries,
+        'records': len(records),
+        'strings': len(encoded),
+    }).encode('utf-8')
+    prefix = len(SNAPSHOT_MAGIC) + 4 + len(header)
+    padding = b"\0" * (-prefix % 4)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(padding)
+        f.write(records.tobytes())
+        f.write(offsets.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(temp_path, path)
+    return len(entries)
+
+# MAPPED SNAPSHOT
+class BankSnapshot:
+    """A memory-mapped snapshot file; raises ValueError if it is not a usable snapshot"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or sys.byteorder != 'little':
+            raise ValueError(f"{path} is not a bank snapshot for this platform")
+        start = len(SNAPSHOT_MAGIC)
+        (header_length,) = struct.unpack_from('<I', self._map, start)
+        start += 4
+        self.header = json.loads(self._map[start:start + header_length])
+        if self.header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is snapshot version {self.header.get('version')}, not {SNAPSHOT_VERSION}")
+        start += header_length
+        start += -start % 4
+
+        view = memoryview(self._map)
+        records_end = start + 4 * self.header['records']
+        offsets_end = records_end + 4 * (self.header['strings'] + 1)
+        self.records = view[start:records_end].cast('I')
+        self.offsets = view[records_end:offsets_end].cast('I')
+        self.data = view[offsets_end:]
+
+    def string(self, string_id):
+        return str(self.data[self.offsets[string_id]:self.offsets[string_id + 1]], 'utf-8')
+
+    def templates(self):
+        """{(subject, year): MappedTemplate} for every entry in the file"""
+        return {
+            (entry['subject'], entry['year']): MappedTemplate(self, entry['offset'])
+            for entry in self.header['entries']
+        }
+
+
+class MappedTemplate:
+    """CommentTemplate stand-in that reads its statements from a BankSnapshot"""
+
+    def __init__(self, snapshot, offset):
+        records = snapshot.records
+        self._snapshot = snapshot
+        self._records = records
+        self._opening_count = records[offset]
+        self._openings = offset + 1
+        self._closer_count = records[self._openings + self._opening_count]
+        self._closers = self._openings + self._opening_count + 1
+        sentence_count = records[self._closers + self._closer_count]
+        self._attitudes = self._closers + self._closer_count + 1
+        self._sentences = []
+        position = self._attitudes + len(PRONOUN_SETS) * SCORE_RANGE
+        for _ in range(sentence_count):
+            self._sentences.append((records[position] == 1, position + 1))
+            position += 1 + len(PRONOUN_SETS) * SCORE_RANGE
+
+    @property
+    def opening_phrases(self):
+        return [self._text(self._openings + i) for i in range(self._opening_count)]
+
+    @property
+    def closer_bank(self):
+        return [self._text(self._closers + i) for i in range(self._closer_count)]
+
+    def _text(self, position):
+        return self._snapshot.string(self._records[position])
+
+    def choose(self, rng=random):
+        """Pick (opening, closer) indices; draws from rng exactly like CommentTemplate.choose"""
+        return rng.randrange(self._opening_count), rng.randrange(self._closer_count)
+
+    def render(self, name, pronouns, att, achieve, target, rng=random, choices=None):
+        """Return the comment sentences in order (opening first, closer last)"""
+        opening, closer = choices if choices is not None else self.choose(rng)
+        att, achieve, target = score_index(att), score_index(achieve), score_index(target)
+        table = PRONOUN_INDEX[pronouns] * SCORE_RANGE
+        parts = [f"{self._text(self._openings + opening)} {name} {self._text(self._attitudes + table + att)}"]
+        for uses_target, start in self._sentences:
+            parts.append(self._text(start + table + (target if uses_target else achieve)))
+        parts.append(self._text(self._closers + closer))
+        return parts
+
+# LOADING
+def read_snapshot(path=SNAPSHOT_PATH):
+    """Templates from a snapshot whose sources are unchanged, or None if the file is unusable"""
+    try:
+        snapshot = BankSnapshot(path)
+    except (OSError, ValueError):
+        return None
+    if snapshot.header.get('code') != code_hash():
+        return None
+
+    fresh = {}
+    templates = snapshot.templates()
+    for entry in snapshot.header['entries']:
+        key = (entry['subject'], entry['year'])
+        source = TEMPLATE_SOURCES.get(key)
+        try:
+            if source is not None and file_hash(source.path) == entry['source']:
+                fresh[key] = templates[key]
+        except OSError:
+            continue
+    return fresh
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Install a snapshot's fresh templates once per process; returns how many were used"""
+    with _load_lock:
+        if path not in _loaded:
+            templates = read_snapshot(path) or {}
+            install_templates(templates)
+            _loaded[path] = len(templates)
+        return _loaded[path]
@@ -0,0 +1,179 @@
+# COMMENT STORE
+# Compact per-session storage for generated comments. Entries are kept as
+# columns instead of one dict each: names and comments in lists, subjects
+# interned as small integer ids, and years and timestamps in typed arrays
+# (timestamps as whole minutes, the precision the app records). Iterating
+# or indexing the store yields the usual entry dicts, built on the fly, so
+# the exporters and the preview take a store or a list interchangeably.
+#
+# The store counts its changes in version, which keys the session's export
+# cache (see exports.ExportCache).
+#
+# matches() filters by subject, year, name and search words for the paged
+# preview. Search uses an inverted index from lower-cased words to entry
+# positions; it is built on the first search and then extended with new
+# entries only, so sessions that never search pay nothing for it. The
+# indexed words are also kept sorted, so a prefix is found by bisection
+# instead of a scan of the whole vocabulary.
+
+import re
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+MINUTE_EPOCH = datetime(1970, 1, 1)
+WORD_PATTERN = re.compile(r"\w+")
+
+def search_words(text):
+    return WORD_PATTERN.findall(text.casefold())
+
+def timestamp_minutes(timestamp):
+    """Whole minutes since 1970-01-01 for a "%Y-%m-%d %H:%M" timestamp"""
+    return (datetime.strptime(timestamp, TIMESTAMP_FORMAT) - MINUTE_EPOCH) // timedelta(minutes=1)
+
+def minutes_timestamp(minutes):
+    return (MINUTE_EPOCH + timedelta(minutes=minutes)).strftime(TIMESTAMP_FORMAT)
+
+class CommentStore:
+    """Append-only columns of comment entries (name, subject, year, comment, timestamp)"""
+
+    def __init__(self, entries=()):
+        self.version = 0
+        self.subjects = []
+        self._subject_ids = {}
+        self._names = []
+        self._subjects = array('H')
+        self._years = array('h')
+        self._comments = []
+        self._minutes = array('q')
+        self._index = {}
+        self._words = []
+        self._indexed = 0
+        self.extend(entries)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __bool__(self):
+        return bool(self._names)
+
+    def __iter__(self):
+        # Entries appended while iterating (e.g. during a download) are not visited
+        for index in range(len(self)):
+            yield self.entry(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("comment index out of range")
+        return self.entry(index)
+
+    def entry(self, index):
+        """The entry dict at index"""
+        return {
+            'name': self._names[index],
+            'subject': self.subjects[self._subjects[index]],
+            'year': self._years[index],
+            'comment': self._comments[index],
+            'timestamp': minutes_timestamp(self._minutes[index]),
+        }
+
+    def _subject_id(self, subject):
+        subject_id = self._subject_ids.get(subject)
+        if subject_id is None:
+            subject_id = self._subject_ids[subject] = len(self.subjects)
+            self.subjects.append(subject)
+        return subject_id
+
+    def add(self, name, subject, year, comment, timestamp):
+        # The name goes last: len() and iteration only see fully added entries
+        self._subjects.append(self._subject_id(subject))
+        self._years.append(int(year))
+        self._comments.append(comment)
+        self._minutes.append(timestamp_minutes(timestamp))
+        self._names.append(name)
+        self.version += 1
+
+    def append(self, entry):
+        """Add one entry dict"""
+        self.add(entry['name'], entry['subject'], entry['year'], entry['comment'], entry['timestamp'])
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def clear(self):
+        """Drop every entry (subject ids are kept)"""
+        del self._names[:]
+        del self._subjects[:]
+        del self._years[:]
+        del self._comments[:]
+        del self._minutes[:]
+        self._index = {}
+        self._words = []
+        self._indexed = 0
+        self.version += 1
+
+    def years(self):
+        """Distinct years present, sorted"""
+        return sorted(set(self._years))
+
+    def present_subjects(self):
+        """Distinct subjects present, in order of first appearance"""
+        return [self.subjects[subject_id] for subject_id in sorted(set(self._subjects))]
+
+    def _update_index(self):
+        """Add entries appended since the last search to the word index"""
+        new_words = []
+        for index in range(self._indexed, len(self)):
+            for word in set(search_words(self._names[index]) + search_words(self._comments[index])):
+                postings = self._index.get(word)
+                if postings is None:
+                    postings = self._index[word] = array('I')
+                    new_words.append(word)
+                postings.append(index)
+        if new_words:
+            self._words.extend(new_words)
+            self._words.sort()
+        self._indexed = len(self)
+
+    def _prefixed(self, prefix):
+        """Indexed words starting with prefix"""
+        words = self._words
+        for position in range(bisect_left(words, prefix), len(words)):
+            if not words[position].startswith(prefix):
+                break
+            yield words[position]
+
+    def _search(self, query):
+        """Sorted positions whose name or comment has a word starting with every query word"""
+        words = search_words(query)
+        if not words:
+            return range(len(self))
+        self._update_index()
+        found = None
+        for word in words:
+            positions = set()
+            for indexed_word in self._prefixed(word):
+                positions.update(self._index[indexed_word])
+            found = positions if found is None else found & positions
+            if not found:
+                return []
+        return sorted(found)
+
+    def matches(self, subject=None, year=None, name='', query=''):
+        """Positions of the entries matching every filter given, in order"""
+        positions = self._search(query)
+        if subject is not None:
+            subject_id = self._subject_ids.get(subject)
+            positions = [i for i in positions if self._subjects[i] == subject_id]
+        if year is not None:
+            positions = [i for i in positions if self._years[i] == year]
+        name = name.strip().casefold()
+        if name:
+            positions = [i for i in positions if name in self._names[i].casefold()]
+        return positions
@@ -0,0 +1,170 @@
+# TEXT HELPERS
+# String helpers used to assemble and clean up report comments: input
+# sanitizing, pronoun handling and the final capitalization/truncation pass.
+
+import re
+from functools import lru_cache
+
+TARGET_CHARS = 500
+
+# HELPER FUNCTIONS
+class SanitizeTable(dict):
+    """str.translate table keeping alphanumerics and " .'-", deleting the rest.
+
+    Code points are classified on first sight and cached, so the table covers
+    all of Unicode without being built up front.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        value = code if char.isalnum() or char in " .'-" else None
+        self[code] = value
+        return value
+
+SANITIZE_TABLE = SanitizeTable()
+
+def sanitize_input(text, max_length=100):
+    """Sanitize user input to prevent injection attacks"""
+    if not text:
+        return ""
+    return text.translate(SANITIZE_TABLE)[:max_length].strip().title()
+
+def sanitize_column(series, max_length=100):
+    """sanitize_input over a whole pandas Series of strings; missing values become """""
+    sanitized = series.fillna('').astype(str).str.translate(SANITIZE_TABLE).str.slice(0, max_length).str.strip()
+    # Arrow's title() cases some letters (e.g. "ß") differently from str.title
+    return sanitized.astype(object).str.title()
+
+def get_pronouns(gender):
+    gender = gender.lower()
+    if gender == "male":
+        return "he", "his"
+    elif gender == "female":
+        return "she", "her"
+    return "they", "their"
+
+# get_pronouns only ever returns these three sets
+PRONOUN_SETS = (("he", "his"), ("she", "her"), ("they", "their"))
+
+def lowercase_first(text):
+    return text[0].lower() + text[1:] if text else ""
+
+def truncate_comment(comment, target=TARGET_CHARS):
+    if len(comment) <= target:
+        return comment
+    truncated = comment[:target].rstrip(" ,;.")
+    if "." in truncated:
+        truncated = truncated[:truncated.rfind(".")+1]
+    return truncated
+
+def fix_pronouns_in_text(text, pronoun, possessive):
+    """Fix gender pronouns in statement text"""
+    if not text:
+        return text
+
+    # Fix pronouns with word boundaries
+    text = re.sub(r'\bhe\b', pronoun, text, flags=re.IGNORECASE)
+    text = re.sub(r'\bHe\b', pronoun.capitalize(), text)
+    text = re.sub(r'\bshe\b', pronoun, text, flags=re.IGNORECASE)
+    text = re.sub(r'\bShe\b', pronoun.capitalize(), text)
+    text = re.sub(r'\bhis\b', possessive, text, flags=re.IGNORECASE)
+    text = re.sub(r'\bHis\b', possessive.capitalize(), text)
+    text = re.sub(r'\bher\b', possessive, text, flags=re.IGNORECASE)
+    text = re.sub(r'\bHer\b', possessive.capitalize(), text)
+    text = re.sub(r'\bhim\b', pronoun, text, flags=re.IGNORECASE)
+    text = re.sub(r'\bHim\b', pronoun.capitalize(), text)
+    text = re.sub(r'\bhimself\b', f"{pronoun}self", text, flags=re.IGNORECASE)
+    text = re.sub(r'\bherself\b', f"{pronoun}self", text, flags=re.IGNORECASE)
+
+    return text
+
+# Free text (optional comments, teacher statements) cannot be precomputed,
+# so it goes through one scan with a precompiled alternation instead of the
+# twelve re.sub passes above. The replacement for each word matches the
+# rules of fix_pronouns_in_text and keeps the case of the original word.
+PRONOUN_PATTERN = re.compile(r"\b(?:himself|herself|he|she|his|her|him)\b", re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def pronoun_table(pronoun, possessive):
+    """Replacement table for PRONOUN_PATTERN in lower, Title and UPPER case"""
+    words = {
+        "he": pronoun,
+        "she": pronoun,
+        "him": pronoun,
+        "his": possessive,
+        "her": possessive,
+        "himself": f"{pronoun}self",
+        "herself": f"{pronoun}self",
+    }
+    table = {}
+    for word, replacement in words.items():
+        table[word] = replacement
+        table[word.capitalize()] = replacement.capitalize()
+        table[word.upper()] = replacement.upper()
+    return table
+
+def rewrite_pronouns(text, pronoun, possessive):
+    """Rewrite gender pronouns in free text in a single pass"""
+    if not text:
+        return text
+    table = pronoun_table(pronoun, possessive)
+
+    def replace(match):
+        word = match.group()
+        replacement = table.get(word)
+        return replacement if replacement is not None else table[word.lower()]
+
+    return PRONOUN_PATTERN.sub(replace, text)
+
+# COMMENT FINALIZER
+def finalize_sentence(part):
+    """One comment part as finalize_comment writes it: ends in a period, capitalized after .!?
+
+    Every part starts a new sentence, so joining the finalized parts with
+    spaces and truncating gives exactly finalize_comment(parts, target).
+    """
+    if not part.endswith('.'):
+        part += '.'
+    chars = []
+    capitalize_next = True
+    for char in part:
+        if capitalize_next and char.isalpha():
+            char = char.upper()
+            capitalize_next = False
+        elif char in ".!?":
+            capitalize_next = True
+        chars.append(char)
+    return ''.join(chars)
+
+def finalize_comment(comment_parts, target):
+    """Terminate, join, capitalize and truncate comment sentences in one pass.
+
+    Gives the same result as adding a missing period to each part, joining
+    with spaces, capitalizing after .!? and truncating to target, but builds
+    a list buffer once and stops as soon as the comment is over target.
+    """
+    buffer = []
+    length = 0
+    capitalize_next = True
+    for index, part in enumerate(comment_parts):
+        if not part.endswith('.'):
+            part += '.'
+        if index:
+            part = ' ' + part
+        for char in part:
+            if capitalize_next and char.isalpha():
+                char = char.upper()
+                capitalize_next = False
+            elif char in ".!?":
+                capitalize_next = True
+            buffer.append(char)
+            length += len(char)
+            if length > target:
+                break
+        if length > target:
+            break
+
+    # Only the first target + 1 characters were read, which is all
+    # truncate_comment looks at when the comment is too long
+    return truncate_comment(''.join(buffer), target)
+
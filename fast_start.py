@@ -0,0 +1,17 @@
+# FAST START FLAG
+# Read by the apps before they import commentcraft, because the flag decides
+# whether Python may write .pyc files for the package and the banks. Keep
+# this module free of package imports.
+#
+# Fast-start mode (COMMENTCRAFT_FAST_START=1) keeps .pyc files and loads the
+# statement banks from the compiled snapshot (python manage_banks.py compile).
+
+import os
+
+FAST_START_ENV = "COMMENTCRAFT_FAST_START"
+
+def fast_start_enabled():
+    """Whether COMMENTCRAFT_FAST_START is set to anything but "" or "0" """
+    return os.environ.get(FAST_START_ENV, "") not in ("", "0")
+
+FAST_START = fast_start_enabled()
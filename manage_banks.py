@@ -0,0 +1,86 @@
+# STATEMENT BANK TOOL
+# Works with the data-file bank format in commentcraft/bankfile.py and the
+# compiled snapshot in commentcraft/snapshot.py.
+#
+# Usage:
+#   python manage_banks.py export English 7 -o bank_data/english_year7.json
+#   python manage_banks.py export Chemistry default -o bank_data/chemistry.json
+#   python manage_banks.py check [bank_data/geography_year7.json ...]
+#   python manage_banks.py compile [-o commentcraft/banks.snapshot]
+#
+# export writes an existing subject/year as a bank file, a starting point
+# for editing it without a code change. check validates bank files (by
+# default every file in bank_data/). compile builds the snapshot used by
+# fast-start mode and by batch workers.
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from commentcraft.bankfile import BANK_DIR, BankFileError, bank_file_paths, read_bank_file, spec_to_file_data
+from commentcraft.banks import BANK_FILE_ERRORS, TEMPLATE_SOURCES, build_template, template_key
+from commentcraft.snapshot import SNAPSHOT_PATH, build_snapshot
+
+def export_bank(args, parser):
+    year = None if args.year == "default" else int(args.year)
+    key = template_key(args.subject, year)
+    if key is None:
+        parser.error(f"unknown subject {args.subject!r}")
+    spec = TEMPLATE_SOURCES[key].spec()
+    spec.update(subject=args.subject, year=year, default=year is None)
+    text = json.dumps(spec_to_file_data(spec), indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Wrote {args.subject} {args.year} -> {args.output}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+def check_banks(args, parser):
+    failed = 0
+    for path in args.paths or bank_file_paths():
+        try:
+            build_template(read_bank_file(path))
+            print(f"ok     {path}")
+        except BankFileError as e:
+            failed += 1
+            print(f"error  {e}")
+        except Exception as e:
+            failed += 1
+            print(f"error  {path}: {e}")
+    return 1 if failed else 0
+
+def compile_banks(args, parser):
+    for path, error in BANK_FILE_ERRORS:
+        print(f"Skipped {error}", file=sys.stderr)
+    count = build_snapshot(args.output)
+    print(f"Wrote {count} templates ({os.path.getsize(args.output)} bytes) -> {args.output}")
+    return 1 if BANK_FILE_ERRORS else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export, check and compile statement banks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write a subject/year's banks as a bank file")
+    export.add_argument("subject")
+    export.add_argument("year", help="year, or 'default' for the subject's default banks")
+    export.add_argument("-o", "--output", help="output .json file (default: stdout)")
+    export.set_defaults(run=export_bank)
+
+    check = commands.add_parser("check", help="validate bank files")
+    check.add_argument("paths", nargs="*", help=f"bank files (default: every file in {BANK_DIR})")
+    check.set_defaults(run=check_banks)
+
+    compile_ = commands.add_parser("compile", help="build the bank snapshot")
+    compile_.add_argument("-o", "--output", default=SNAPSHOT_PATH, help=f"snapshot file (default: {SNAPSHOT_PATH})")
+    compile_.set_defaults(run=compile_banks)
+
+    args = parser.parse_args(argv)
+    return args.run(args, parser)
+
+if __name__ == "__main__":
+    sys.exit(main())